@@ -0,0 +1,111 @@
+"""Benchmarks for the hot paths of the experiment.
+
+Each benchmark is a function that does any setup and returns a callable to
+be timed. Benchmarks are registered with the parameters they are run over.
+"""
+import os
+import tempfile
+from collections import OrderedDict
+from itertools import product
+
+from gems import SimpleHill, util
+
+
+GRID_SIZES = [50, 100, 200]
+SIGHT_RADII = [5, 10, 20]
+
+PARAMETERS = dict(grid_size=GRID_SIZES, sight_radius=SIGHT_RADII)
+
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(*param_names):
+    """Register a benchmark to be run over all combinations of parameters."""
+    def register(func):
+        BENCHMARKS[func.__name__] = (func, param_names)
+        return func
+    return register
+
+
+def iter_cases(pattern=None):
+    """Yield the name and timed callable of every benchmark case."""
+    for name, (func, param_names) in BENCHMARKS.items():
+        if pattern is not None and pattern not in name:
+            continue
+        for values in product(*[PARAMETERS[p] for p in param_names]):
+            params = OrderedDict(zip(param_names, values))
+            label = ','.join('{}={}'.format(*item) for item in params.items())
+            yield '{}[{}]'.format(name, label), func(**params)
+
+
+def make_landscape(grid_size):
+    return SimpleHill(n_rows=grid_size, n_cols=grid_size, seed=100)
+
+
+def get_center(grid_size):
+    return (grid_size//2, grid_size//2)
+
+
+@benchmark('grid_size', 'sight_radius')
+def get_neighborhood(grid_size, sight_radius):
+    landscape = make_landscape(grid_size)
+    center = get_center(grid_size)
+    return lambda: landscape.get_neighborhood(center, sight_radius)
+
+
+@benchmark('grid_size', 'sight_radius')
+def sample_neighborhood(grid_size, sight_radius):
+    landscape = make_landscape(grid_size)
+    center = get_center(grid_size)
+    return lambda: landscape.sample_neighborhood(6, center, sight_radius)
+
+
+@benchmark('grid_size', 'sight_radius')
+def score(grid_size, sight_radius):
+    landscape = make_landscape(grid_size)
+    neighborhood = landscape.get_neighborhood(get_center(grid_size), sight_radius)
+    return lambda: [landscape.get_score(pos) for pos in neighborhood]  # not the cached score
+
+
+@benchmark('grid_size')
+def to_tidy_data(grid_size):
+    landscape = make_landscape(grid_size)
+    return landscape.to_tidy_data
+
+
+@benchmark('grid_size')
+def export(grid_size):
+    landscape = make_landscape(grid_size)
+    filename = os.path.join(tempfile.mkdtemp(), 'landscape.csv')
+    return lambda: landscape.export(filename)
+
+
+@benchmark('sight_radius')
+def parse_pos_list(sight_radius):
+    pos_list_str = util.pos_list_to_str(make_landscape(100).sample_neighborhood(6, (50, 50), sight_radius))
+    return lambda: util.parse_pos_list(pos_list_str)
+
+
+@benchmark('sight_radius')
+def pos_list_to_str(sight_radius):
+    pos_list = make_landscape(100).sample_neighborhood(6, (50, 50), sight_radius)
+    return lambda: util.pos_list_to_str(pos_list)
+
+
+@benchmark('sight_radius')
+def write_trial(sight_radius):
+    # Format rows as Experiment.write_trial does, without importing psychopy
+    output = open(os.devnull, 'w')
+
+    landscape = make_landscape(100)
+    stims = landscape.sample_neighborhood(6, (50, 50), sight_radius)
+    trial_data = dict(
+        subj_id='GEMS100', date='2018_Oct_12_1509', computer='Kramer',
+        experimenter='XXX', version='1.2', generation=1, inherit_from='',
+        sight_radius=sight_radius, n_gabors=6, sampling='uniform', block_ix=1,
+        landscape_name='SimpleHill', starting_pos='0-0', starting_score=0,
+        trial=0, pos='50-50', stims=util.pos_list_to_str(stims),
+        selected=util.pos_to_str(stims[0]), rt=1.23, score=99, delta=-1,
+        exp_time=123.456,
+    )
+    return lambda: output.write(','.join(util.format_trial_row(trial_data)) + '\n')
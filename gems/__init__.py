@@ -1,4 +1,3 @@
-from experiment import Experiment
-from landscape import Landscape, SimpleHill
+from landscape import Landscape, SimpleHill, FeatureSpaceLandscape
 from display import create_radial_positions, create_grid_positions, create_line_positions
 from util import create_grid
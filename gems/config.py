@@ -4,13 +4,19 @@ pkg_root = path.dirname(path.abspath(__file__))
 EXP_ROOT = path.dirname(pkg_root)
 DATA_DIR = path.join(EXP_ROOT, 'data')
 INSTRUCTIONS_DIR = path.join(DATA_DIR, 'instructions')
+TIMING_DIR = path.join(DATA_DIR, 'timing')
 LANDSCAPE_FILES = path.join(pkg_root, 'landscapes')
 GABORS_DIR = path.join(pkg_root, 'gabors')
 
-for expected_dir in [DATA_DIR, INSTRUCTIONS_DIR, LANDSCAPE_FILES, GABORS_DIR]:
+for expected_dir in [DATA_DIR, INSTRUCTIONS_DIR, TIMING_DIR, LANDSCAPE_FILES, GABORS_DIR]:
     if not path.isdir(expected_dir):
         mkdir(expected_dir)
 
+# Defaults of the experiment, which simulations can read without a window
+SIGHT_RADIUS = 10         # range of sight on the grid in the landscape
+N_GABORS = 6              # gabors per trial
+N_TRIALS_PER_BLOCK = 40
+
 data_columns = [
     'subj_id', 'date', 'computer', 'experimenter', 'version',
     'generation', 'inherit_from',
@@ -18,5 +24,6 @@ data_columns = [
     'block_ix', 'landscape_name', 'starting_pos', 'starting_score',
     'trial', 'pos', 'stims',
     'selected', 'rt', 'score', 'delta',
-    'exp_time'
+    'exp_time',
+    'sampling',  # added after the first sessions, so read_subj_data fills it in
 ]
@@ -0,0 +1,189 @@
+"""Coordinate transmission chains across lab stations.
+
+The state of every chain is kept in a JSON file on a shared drive. A
+station leases the next generation of a chain when a session starts, and
+the chain advances as soon as that session records its instructions, so
+other stations can run the following generation in parallel with the rest
+of the session.
+
+Expected JSON data
+------------------
+
+    {
+      "chains": {
+        "A": {"subj_ids": ["GEMS101", "GEMS105"], "lease": null},
+        "B": {"subj_ids": ["GEMS102"],
+              "lease": {"station": "Kramer", "time": 1539356940.0}}
+      }
+    }
+"""
+import os
+import json
+import time
+import errno
+from contextlib import contextmanager
+
+
+class ChainsUnavailable(Exception):
+    """No chain can be leased because every chain is already leased."""
+
+
+class LeaseLost(Exception):
+    """A station's lease on a chain expired and another station reclaimed it."""
+
+
+class ChainCoordinator(object):
+    """Lease the next generation of each chain to lab stations.
+
+    Every read-modify-write of the store holds a lock file next to it, so
+    any number of stations can share the store.
+    """
+    lease_timeout = 2 * 60 * 60  # seconds before a lease is reclaimed
+    lock_timeout = 10            # seconds to wait for the lock
+    lock_stale = 60              # seconds before a lock is assumed abandoned
+
+    def __init__(self, store):
+        self.store = store
+        self.lock_file = store + '.lock'
+
+    def create(self, chain_names, subj_ids=None):
+        """Add chains to the store, optionally continuing previous chains.
+
+        Parameters
+        ----------
+        chain_names: list of str, Names of the chains to add.
+        subj_ids: dict, Map of chain name to the subj_ids already in that
+            chain, in order of generation.
+        """
+        subj_ids = subj_ids or {}
+        with self.edit() as chains:
+            for name in chain_names:
+                if name in chains:
+                    raise ValueError("chain '{}' already exists".format(name))
+                chains[name] = dict(subj_ids=list(subj_ids.get(name, [])), lease=None)
+
+    def lease(self, station):
+        """Lease the next generation of a chain to a station.
+
+        A station that already holds a lease gets the same chain back.
+        Otherwise the station gets the chain with the fewest generations
+        that is not leased, so that chains advance together.
+
+        Returns
+        -------
+        dict, with chain, generation and inherit_from.
+        """
+        now = time.time()
+        with self.edit() as chains:
+            held = [name for name, chain in chains.items()
+                    if self.is_leased(chain, now) and chain['lease']['station'] == station]
+            if held:
+                name = held[0]
+            else:
+                available = [name for name, chain in chains.items()
+                             if not self.is_leased(chain, now)]
+                if not available:
+                    raise ChainsUnavailable('All {} chains are leased.'.format(len(chains)))
+                name = min(available, key=lambda name: (len(chains[name]['subj_ids']), name))
+            chains[name]['lease'] = dict(station=station, time=now)
+            return self.get_slot(name, chains[name])
+
+    def complete(self, name, subj_id, station):
+        """Add a subject to a chain and end the station's lease on the chain.
+
+        A lease that has expired can still be completed by its station, as
+        long as no other station has reclaimed the chain since.
+
+        Raises
+        ------
+        LeaseLost, if the station no longer holds the lease on the chain,
+        so the chain is left as it is.
+        """
+        with self.edit() as chains:
+            chain = chains[name]
+            lease = chain['lease']
+            if lease is None or lease['station'] != station:
+                holder = 'no station' if lease is None else lease['station']
+                raise LeaseLost("Chain '{}' is leased to {}, not {}. {} was not added to the chain.".format(
+                    name, holder, station, subj_id))
+            chain['subj_ids'].append(subj_id)
+            chain['lease'] = None
+
+    def release(self, name, station):
+        """End a station's lease on a chain without adding a generation."""
+        with self.edit() as chains:
+            lease = chains[name]['lease']
+            if lease is not None and lease['station'] == station:
+                chains[name]['lease'] = None
+
+    def status(self):
+        """List the generation and lease of every chain."""
+        now = time.time()
+        chains = self.read()
+        rows = []
+        for name in sorted(chains):
+            chain = chains[name]
+            slot = self.get_slot(name, chain)
+            leased = self.is_leased(chain, now)
+            slot['station'] = chain['lease']['station'] if leased else ''
+            slot['leased_for'] = int(now - chain['lease']['time']) if leased else ''
+            rows.append(slot)
+        return rows
+
+    def get_slot(self, name, chain):
+        subj_ids = chain['subj_ids']
+        return dict(chain=name,
+                    generation=len(subj_ids) + 1,
+                    inherit_from=subj_ids[-1] if subj_ids else '')
+
+    def is_leased(self, chain, now):
+        lease = chain['lease']
+        return lease is not None and (now - lease['time']) < self.lease_timeout
+
+    def read(self):
+        if not os.path.exists(self.store):
+            return {}
+        with open(self.store) as f:
+            return json.load(f)['chains']
+
+    @contextmanager
+    def edit(self):
+        """Lock the store and yield its chains, saving any changes."""
+        with self.locked():
+            chains = self.read()
+            yield chains
+            tmp = self.store + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(dict(chains=chains), f, indent=2, sort_keys=True)
+            os.rename(tmp, self.store)
+
+    @contextmanager
+    def locked(self):
+        start = time.time()
+        while True:
+            try:
+                fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+                self.break_stale_lock()
+                if time.time() - start > self.lock_timeout:
+                    raise IOError('Timed out waiting for lock on {}'.format(self.store))
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.remove(self.lock_file)
+
+    def break_stale_lock(self):
+        try:
+            age = time.time() - os.path.getmtime(self.lock_file)
+        except OSError:
+            return  # lock was released
+        if age > self.lock_stale:
+            try:
+                os.remove(self.lock_file)
+            except OSError:
+                pass
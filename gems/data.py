@@ -0,0 +1,33 @@
+"""Load the data collected in experiment sessions."""
+from glob import glob
+from os import path
+
+import pandas
+
+from .config import DATA_DIR, data_columns
+
+
+def list_subj_files(data_dir=DATA_DIR):
+    """List the session files in the data directory, sorted by subj_id."""
+    return sorted(glob(path.join(data_dir, 'GEMS*.csv')))
+
+
+def read_subj_data(filepath):
+    """Read the trials in a single session file.
+
+    Rows that are not trials, e.g. partial lines left by a session that was
+    quit mid-write, are dropped.
+    """
+    trials = pandas.read_csv(filepath)
+    if 'sampling' not in trials.columns:
+        trials['sampling'] = 'uniform'  # sessions from before sampling was recorded
+    trials = trials.loc[trials.trial.notnull(), data_columns]
+    int_columns = ['generation', 'sight_radius', 'n_gabors', 'block_ix', 'trial']
+    trials[int_columns] = trials[int_columns].astype(int)
+    return trials
+
+
+def load_data(data_dir=DATA_DIR):
+    """Consolidate the trials from all sessions in a single data frame."""
+    subj_files = list_subj_files(data_dir)
+    return pandas.concat([read_subj_data(f) for f in subj_files], ignore_index=True)
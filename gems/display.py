@@ -1,8 +1,8 @@
 from itertools import product
 from numpy import linspace
-from psychopy.tools.coordinatetools import pol2cart
 
 def create_radial_positions(n_positions, radius):
+    from psychopy.tools.coordinatetools import pol2cart
     thetas = linspace(0, 360, n_positions, endpoint=False)
     return [pol2cart(theta, radius) for theta in thetas]
 
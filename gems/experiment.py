@@ -1,7 +1,10 @@
 import string
+import socket
+import textwrap
 import subprocess
 import webbrowser
 from os import path
+from timeit import default_timer
 
 import yaml
 
@@ -9,15 +12,31 @@ import pandas
 from psychopy import visual, core, event
 
 from . import landscape
-from .config import pkg_root, data_columns, INSTRUCTIONS_DIR
+from .config import (pkg_root, data_columns, INSTRUCTIONS_DIR, TIMING_DIR,
+                     SIGHT_RADIUS, N_GABORS, N_TRIALS_PER_BLOCK)
 from .display import create_radial_positions, create_line_positions
-from .util import pos_to_str, pos_list_to_str
-from .subj_info import get_subj_info, make_output_filepath, check_output_filepath, convert_condition_vars, verify_subj_info
+from .util import pos_to_str, pos_list_to_str, format_trial_row
+from .subj_info import get_subj_info, make_output_filepath, check_output_filepath, convert_condition_vars, verify_subj_info, popup_error
 from .inherited_instructions import load_ancestor_instructions
+from .timing import PhaseTimer
+from .frames import FrameScheduler
+from .memory import MemoryTracker
+from .schedule import LandscapeSchedule
+from .coordinator import ChainCoordinator, ChainsUnavailable, LeaseLost
 
 
 EXPERIMENT_VERSION = '1.2'
 
+_texts = {}
+
+
+def load_texts(texts_yaml=path.join(pkg_root, 'texts.yaml')):
+    """Load the texts for the experiment, parsing each file only once."""
+    if texts_yaml not in _texts:
+        with open(texts_yaml) as f:
+            _texts[texts_yaml] = yaml.load(f)
+    return _texts[texts_yaml]
+
 
 class Experiment(object):
     # Responses ----
@@ -36,16 +55,37 @@ class Experiment(object):
 
     # Stimulus presentation ----
     gabor_size = 120    # in pix
-    n_gabors = 6        # gabors per trial
+    n_gabors = N_GABORS
     gabor_y_pos = 75
     prev_gabor_y_pos = -175
     stim_radius = 200   # pix between fix and center of grating stim
+    welcome_grid_positions = [(30, 30), (50, 50), (70, 70)]  # example gems
 
     # Players ----
     total_score = 0
-    sight_radius = 10  # range of sight on the grid in the landscape
+    sight_radius = SIGHT_RADIUS
     pos = (0, 0)       # initial grid position on the landscape
-    n_trials_per_block = 40
+    n_trials_per_block = N_TRIALS_PER_BLOCK
+    landscapes = ['SimpleHill', 'SimpleHill', 'SimpleHill', 'SimpleHill']  # one per block
+    starting_positions = [(0, 0), (0, 0), (0, 0), (0, 0)]
+    sampling = 'uniform'  # how gems are sampled from the neighborhood, see gems.sampling
+
+    # Instructions entry ----
+    instructions_width = 500          # pix, width of the message box
+    instructions_height = 280         # pix, between the description and the error text
+    instructions_idle_wait = 0.01     # seconds to sleep when no key was pressed
+
+    # Chains ----
+    coordinator = None  # path to a chain store shared between stations
+
+    # Preloading ----
+    n_warm_up_flips = 10
+    warm_up_chars = string.ascii_letters + string.digits + string.punctuation + ' '
+
+    # Instrumentation ----
+    time_phases = False     # record the duration of each phase of a trial
+    profile_blocks = False  # run cProfile over each block of trials
+    track_memory = False    # report memory growth between blocks
 
     # Defaults ----
     text_kwargs = dict(font='Consolas', color='black', pos=(0,50))
@@ -53,19 +93,50 @@ class Experiment(object):
 
     @classmethod
     def from_gui(cls, gui_yaml):
-        """Create an experiment after obtaining condition vars from a GUI."""
-        subj_info = get_subj_info(gui_yaml,
-            version=EXPERIMENT_VERSION,
-            check_exists=check_output_filepath,
-            verify=verify_subj_info,
-            save_order=True)
+        """Create an experiment after obtaining condition vars from a GUI.
+
+        If a chain coordinator is in use, the generation and the subject to
+        inherit from are leased from the coordinator instead of being
+        entered by hand. If every chain is leased, the stations holding
+        the leases are shown and the experiment quits.
+        """
+        slot = None
+        if cls.coordinator is not None:
+            chains = ChainCoordinator(cls.coordinator)
+            station = socket.gethostname()
+            try:
+                slot = chains.lease(station)
+            except ChainsUnavailable as err:
+                leases = ['{chain} by {station}'.format(**row) for row in chains.status() if row['station']]
+                popup_error('{} Leases: {}'.format(err, '; '.join(leases)))
+                core.quit()
+
+        try:
+            subj_info = get_subj_info(gui_yaml,
+                version=EXPERIMENT_VERSION,
+                check_exists=check_output_filepath,
+                verify=verify_subj_info,
+                save_order=True,
+                fixed=slot)
+        except SystemExit:
+            # Cancelled the gui, so give up the lease
+            if slot is not None:
+                chains.release(slot['chain'], station)
+            raise
+
         subj_info = convert_condition_vars(subj_info)
         return cls(**subj_info)
 
     def __init__(self, **condition_vars):
         self.condition_vars = condition_vars
-        self.texts = yaml.load(open(path.join(pkg_root, 'texts.yaml')))
+        self.texts = load_texts()
         self._cache = {}
+        self.timer = PhaseTimer(enabled=self.time_phases, profile_blocks=self.profile_blocks)
+        self.memory = MemoryTracker(enabled=self.track_memory)
+
+        self.chains = None
+        if self.coordinator is not None and self.get_var('chain'):
+            self.chains = ChainCoordinator(self.coordinator)
 
         self.stim_positions = \
             create_line_positions(self.n_gabors, screen_width=self.win.size[0]-(2*self.gabor_size), y_pos=self.gabor_y_pos)
@@ -102,7 +173,9 @@ class Experiment(object):
 
         self.prev_gem_text = self.make_text('Here is the gem you selected last.', draw=False, pos=(0,self.prev_gabor_y_pos-self.gabor_size))
         self.mouse = event.Mouse()
-        self.use_landscape('SimpleHill')
+        self.schedule = LandscapeSchedule([name for name, _ in self.get_blocks()])
+        self.schedule.start()  # build the landscapes while instructions are shown
+        self.set_landscape(self.schedule.get(0))
         self.exp_timer = core.Clock()
 
         try:
@@ -111,6 +184,7 @@ class Experiment(object):
             self.prefilled_survey_url = self.get_text('survey').format(subj_id='', computer='')
 
     def run(self):
+        self.preload()
         self.exp_timer.reset()
         self.show_welcome()
         self.show_example_trial()
@@ -122,6 +196,68 @@ class Experiment(object):
         self.show_end()
         self.quit()
 
+    def preload(self):
+        """Load everything needed by the timed screens before they are shown.
+
+        Opens the window and measures its refresh rate, loads images, fonts
+        and the stimuli for the start of the first block, and draws one of
+        each kind of stimulus so that textures and shaders are ready before
+        the first timed screen.
+
+        Returns a list of (stage, seconds) load times.
+        """
+        stages = [
+            ('window', lambda: self.win),
+            ('refresh_rate', self.frames.measure),
+            ('images', self.preload_images),
+            ('fonts', self.preload_fonts),
+            ('stimuli', self.preload_stimuli),
+            ('warm_up', self.warm_up_window),
+        ]
+
+        load_times = []
+        for stage, load in stages:
+            start = default_timer()
+            load()
+            load_times.append((stage, default_timer() - start))
+
+        print('Preloaded in {:.2f}s ({})'.format(
+            sum(seconds for _, seconds in load_times),
+            ', '.join('{} {:.3f}s'.format(*load_time) for load_time in load_times)))
+        self.memory.snapshot('preloaded')
+        return load_times
+
+    def preload_images(self):
+        self.make_explorer(draw=False)
+
+    def preload_fonts(self):
+        """Render every character in each style of text used in the experiment."""
+        fonts = self._cache.setdefault('fonts', [])
+        for kwargs in [dict(), dict(height=30), dict(height=30, bold=True)]:
+            fonts.append(self.make_text(self.warm_up_chars, draw=False, opacity=0, **kwargs))
+
+    def preload_stimuli(self):
+        """Create the gems that are shown on the welcome screen."""
+        self._cache['welcome_gabors'] = list(
+            self.landscape.get_grid_of_grating_stims(self.welcome_grid_positions).values()
+        )
+
+    def warm_up_window(self):
+        """Draw invisible stimuli of each kind over a few flips."""
+        stims = list(self._cache.get('fonts', []))
+        gabor = self.landscape.get_grating_stim(self.pos)
+        explorer = self.make_explorer(draw=False)
+        highlight = self.highlight_selected((0, 0), lineColor='black')
+        for stim in [gabor, explorer, highlight]:
+            stim.opacity = 0
+            stims.append(stim)
+
+        for _ in range(self.n_warm_up_flips):
+            for stim in stims:
+                stim.draw()
+            self.frames.flip()
+        explorer.opacity = 1
+
     def show_welcome(self, save_screenshot=False):
         self.make_title(self.get_text('welcome_title'))
 
@@ -138,14 +274,14 @@ class Experiment(object):
 
         self.make_explorer()
 
-        selected_grid_positions = [(30, 30), (50, 50), (70, 70)]
+        if 'welcome_gabors' not in self._cache:
+            self.preload_stimuli()
         stim_positions = [(-200, -150), (0, -150), (200, -150)]
-        for grid_pos, gabor_pos in zip(selected_grid_positions, stim_positions):
-            gabor = self.landscape.get_grating_stim(grid_pos)
+        for gabor, gabor_pos in zip(self._cache['welcome_gabors'], stim_positions):
             gabor.pos = gabor_pos
             gabor.draw()
 
-        self.win.flip()
+        self.frames.flip()
         event.waitKeys(keyList=self.response_keys)
 
     def show_example_trial(self):
@@ -162,7 +298,7 @@ class Experiment(object):
         # self.fixation.draw()
         for gabor in gabors.values():
             gabor.draw()
-        self.win.flip()
+        self.frames.flip()
         event.waitKeys(['space'])
 
     def show_inherited_instructions(self):
@@ -170,21 +306,21 @@ class Experiment(object):
         inherited = load_ancestor_instructions(self.get_var('inherit_from'))
         body = self.get_text("ancestor_instructions").format(ancestor_response=inherited)
         self.make_text(body)
-        self.win.flip()
+        self.frames.flip()
         event.waitKeys(['space'])
 
     def show_foreshadow(self):
         self.make_title(self.get_text("foreshadow_title"))
         self.make_text(self.get_text("foreshadow"))
         self.make_explorer()
-        self.win.flip()
+        self.frames.flip()
         event.waitKeys(['space'])
 
     def show_pre_test(self):
         self.make_title(self.get_text('pre_test_title'))
         self.make_text(self.get_text("pre_test"))
         self.make_explorer()
-        self.win.flip()
+        self.frames.flip()
         event.waitKeys(['space'])
 
     def record_instructions(self):
@@ -192,16 +328,31 @@ class Experiment(object):
         instructions_path = path.join(INSTRUCTIONS_DIR, '{}.txt'.format(self.get_var('subj_id')))
         open(instructions_path, 'w').write(instructions)
 
+        if self.chains is not None:
+            # The next generation of this chain can start now
+            try:
+                self.chains.complete(self.get_var('chain'), self.get_var('subj_id'), socket.gethostname())
+            except LeaseLost as e:
+                print(e)
+            self.chains = None
+
     def get_instructions(self):
+        """Get the instructions typed by the participant.
+
+        The screen is only redrawn after a key changes it. The message is
+        wrapped into lines, each in its own text stim, so a keystroke only
+        lays out the line being typed. Messages longer than the message box
+        scroll, so the line being typed is always shown.
+        """
         typing = True
         is_cap = False
         message = ''
 
         texts = self.get_text("instructions")
-        title = self.make_title(texts["title"])
-        descr = self.make_text(texts["descr"], pos=(0, 180))
-        text_box = self.make_text('_', pos=(-250, 0), wrapWidth=500, alignHoriz='left')
-        error = self.make_text("", pos=(0, -180), color="red")
+        title = self.make_title(texts["title"], draw=False)
+        descr = self.make_text(texts["descr"], pos=(0, 180), draw=False)
+        error = self.make_text("", pos=(0, -180), color="red", draw=False)
+        lines = []  # text stims for each line of the message
 
         punct = dict(
             period = '.',
@@ -209,18 +360,32 @@ class Experiment(object):
             apostrophe = "'",
         )
 
+        changed = True
         while typing:
+            if changed:
+                self.layout_lines(lines, message + '_')
+                title.draw()
+                descr.draw()
+                for line in lines:
+                    line.draw()
+                error.draw()
+                self.frames.flip()
+                changed = False
+
             keys = event.getKeys()
-            if keys:
-                key = keys[0]
+            if not keys:
+                core.wait(self.instructions_idle_wait, hogCPUperiod=0)
+                continue
 
+            for key in keys:
                 if key == 'escape':  # bit.ly/pyglet-key-names
                     if len(message) < 100:
                         error.setText(texts["too_short"])
-                        continue
+                        changed = True
                     else:
                         typing = False
-                        continue
+                        break
+                    continue
                 elif key in ['lshift', 'rshift']:
                     is_cap = True
                     continue
@@ -238,28 +403,75 @@ class Experiment(object):
                     key = key.upper()
                     is_cap = False
 
-                error.setText("")
+                if error.text:
+                    error.setText("")
                 message += key
-                text_box.setText(message + "_")
-
-            title.draw()
-            descr.draw()
-            text_box.draw()
-            error.draw()
-            self.win.flip()
+                changed = True
 
         return message
 
-    def run_test_trials(self):
+    def layout_lines(self, lines, text):
+        """Wrap text into lines of text stims, only updating lines that changed.
 
-        self.use_landscape('SimpleHill')
+        The lines are centered vertically in the message box, and only the
+        last lines that fit in the box are shown.
+        """
+        chars_per_line, line_height = self.instructions_layout
+        wrapped = textwrap.wrap(text, chars_per_line, drop_whitespace=False) or ['']
+        max_lines = max(1, int(self.instructions_height // line_height))
+        wrapped = wrapped[-max_lines:]
+        top = (len(wrapped) - 1) * line_height / 2.0
+        for i, line_text in enumerate(wrapped):
+            if i == len(lines):
+                lines.append(self.make_text('', draw=False, alignHoriz='left'))
+            if lines[i].text != line_text:
+                lines[i].setText(line_text)
+            pos = (-self.instructions_width / 2.0, top - i * line_height)
+            if tuple(lines[i].pos) != pos:
+                lines[i].pos = pos
+        del lines[len(wrapped):]
+
+    @property
+    def instructions_layout(self):
+        """Measure the characters per line and line height of the message box.
+
+        Returns
+        -------
+        (chars_per_line, line_height) in the font of the message, in pix.
+        """
+        if 'instructions_layout' not in self._cache:
+            sample = 'x' * 20  # the message font is monospaced
+            width, line_height = self.make_text(sample, draw=False).boundingBox
+            chars_per_line = max(1, int(self.instructions_width // (width / float(len(sample)))))
+            self._cache['instructions_layout'] = (chars_per_line, line_height)
+        return self._cache['instructions_layout']
+
+    def get_blocks(self):
+        """Get the landscape name and starting position for each block.
+
+        The landscapes can be set for a session with a comma separated list
+        in the "landscapes" condition var, which must name a landscape for
+        every block, because the instructions are recorded before block 3.
+        """
+        landscapes = self.get_var('landscapes') or self.landscapes
+        if isinstance(landscapes, basestring):
+            landscapes = [name.strip() for name in landscapes.split(',')]
+        if len(landscapes) != len(self.starting_positions):
+            raise ValueError('Expected a landscape for each of the {} blocks, got {}: {}'.format(
+                len(self.starting_positions), len(landscapes), ', '.join(landscapes)))
+        return zip(landscapes, self.starting_positions)
+
+    def run_test_trials(self):
 
-        for landscape_ix, start_pos in enumerate([(0,0), (0,0), (0,0), (0,0)]):
+        for landscape_ix, (landscape_name, start_pos) in enumerate(self.get_blocks()):
             if landscape_ix == 2:
                 self.record_instructions()
             elif landscape_ix > 0:
                 self.show_break()
 
+            with self.timer.phase('landscape_wait'):
+                self.set_landscape(self.schedule.get(landscape_ix))
+
             self.pos = start_pos
             self.total_score = self.landscape.score(start_pos)
 
@@ -267,21 +479,27 @@ class Experiment(object):
                 generation=self.get_var('generation'),
                 inherit_from=self.get_var('inherit_from'),
                 block_ix=landscape_ix+1,
-                landscape_name=self.landscape.__class__.__name__,
+                landscape_name=landscape_name,
                 starting_pos=pos_to_str(self.pos),
                 starting_score=self.total_score
             )
 
-            for trial in range(self.n_trials_per_block):
-                trial_data = self.run_trial(trial=trial, feedback='selected', landscape_title='Quarry #{}'.format(landscape_ix+1))
-                trial_data.update(block_data)
-                self.write_trial(trial_data)
+            self.timer.block_ix = landscape_ix+1
+            with self.timer.profile('block{}'.format(landscape_ix+1)):
+                for trial in range(self.n_trials_per_block):
+                    self.timer.trial = trial
+                    trial_data = self.run_trial(trial=trial, feedback='selected', landscape_title='Quarry #{}'.format(landscape_ix+1))
+                    trial_data.update(block_data)
+                    with self.timer.phase('write_trial'):
+                        self.write_trial(trial_data)
+
+            self.memory.snapshot('block{}'.format(landscape_ix+1))
 
     def show_end(self):
         end_title = self.make_title(self.texts['end_title'])
         end = self.make_text(self.texts['end'])
         self.make_explorer()
-        self.win.flip()
+        self.frames.flip()
         event.waitKeys(keyList=self.response_keys)
         webbrowser.open(self.prefilled_survey_url)
 
@@ -306,13 +524,15 @@ class Experiment(object):
             version=self.get_var('version'),
             sight_radius = self.sight_radius,
             n_gabors = self.n_gabors,
+            sampling = self.landscape.sampling,
             pos = pos_to_str(self.pos)
         )
         trial_data.update(kwargs)
         return trial_data
 
     def run_trial(self, trial=0, feedback='training', landscape_title='', save_screenshot=False):
-        gabors = self.sample_gabors()
+        with self.timer.phase('sample_gabors'):
+            gabors = self.sample_gabors()
         trial_data = self.make_trial_data(feedback=feedback,
                                           stims=pos_list_to_str(gabors.keys()),
                                           trial=trial)
@@ -321,35 +541,40 @@ class Experiment(object):
 
         # Begin trial presentation ----
         #self.fixation.draw()
-        prev_gem = None
-        self.landscape_title.draw()
-        if trial > 0:
-            self.prev_gem_text.draw()
-            prev_gem = self.landscape.get_grating_stim(self.pos)
-            prev_gem.pos = (0, self.prev_gabor_y_pos)
-            prev_gem.draw()
-            self.draw_score()
-            self.trial_header.text = self.get_trial_text('instructions_N')
-        else:
-            # first trial in block
-            self.trial_header.text = self.get_trial_text('instructions_0')
-        self.win.flip()
-        core.wait(self.duration_fix)
-
-        self.trial_header.draw()
-        self.landscape_title.draw()
-        if trial > 0:
-            prev_gem.draw()
-            self.prev_gem_text.draw()
-            self.draw_score()
-        # self.fixation.draw()
-        for gabor in gabors.values():
-            gabor.draw()
-        self.win.flip()
+        with self.timer.phase('draw'):
+            prev_gem = None
+            self.landscape_title.draw()
+            if trial > 0:
+                self.prev_gem_text.draw()
+                prev_gem = self.landscape.get_grating_stim(self.pos)
+                prev_gem.pos = (0, self.prev_gabor_y_pos)
+                prev_gem.draw()
+                self.draw_score()
+                self.trial_header.text = self.get_trial_text('instructions_N')
+            else:
+                # first trial in block
+                self.trial_header.text = self.get_trial_text('instructions_0')
+        with self.timer.phase('win_flip'):
+            self.frames.flip()
+        self.frames.hold('fix', self.duration_fix)
+
+        with self.timer.phase('draw'):
+            self.trial_header.draw()
+            self.landscape_title.draw()
+            if trial > 0:
+                prev_gem.draw()
+                self.prev_gem_text.draw()
+                self.draw_score()
+            # self.fixation.draw()
+            for gabor in gabors.values():
+                gabor.draw()
+        with self.timer.phase('win_flip'):
+            self.frames.flip()
         if save_screenshot:
             self.save_screenshot('{}_trial.png'.format(feedback))
 
-        grid_pos, time = self.get_clicked_gabor(gabors)
+        with self.timer.phase('get_clicked_gabor'):
+            grid_pos, time = self.get_clicked_gabor(gabors)
         trial_data['exp_time'] = self.exp_timer.getTime()
 
         # Compare selected gem to prev trial gem
@@ -361,20 +586,23 @@ class Experiment(object):
         self.pos = grid_pos               # move to new pos
         self.total_score = new_gem_score  # update total score
 
-        if feedback == 'training':
-            self.give_training_feedback(gabors, prev_grid_pos, grid_pos, trial, save_screenshot=save_screenshot)
-        elif feedback == 'selected':
-            self.give_selected_feedback(gabors, prev_grid_pos, grid_pos, trial, save_screenshot=save_screenshot)
+        with self.timer.phase('feedback'):
+            if feedback == 'training':
+                self.give_training_feedback(gabors, prev_grid_pos, grid_pos, trial, save_screenshot=save_screenshot)
+            elif feedback == 'selected':
+                self.give_selected_feedback(gabors, prev_grid_pos, grid_pos, trial, save_screenshot=save_screenshot)
 
         trial_data['selected'] = pos_to_str(grid_pos)
         trial_data['rt'] = round(time, 2)
         trial_data['score'] = new_gem_score
         trial_data['delta'] = diff_from_prev_gem
 
-        self.landscape_title.draw()
-        self.draw_score()
-        self.win.flip()
-        core.wait(self.duration_iti)
+        with self.timer.phase('draw'):
+            self.landscape_title.draw()
+            self.draw_score()
+        with self.timer.phase('win_flip'):
+            self.frames.flip()
+        self.frames.hold_until_flip('iti', self.duration_iti)  # the next trial is prepared during the iti
 
         return trial_data
 
@@ -426,7 +654,7 @@ class Experiment(object):
             prev_score = None
         self.draw_score(prev_score)
         highlight.draw()
-        self.win.flip()
+        self.frames.flip()
         if save_screenshot:
             self.save_screenshot('training_trial_feedback.png')
         self.get_clicked_gabor(gabors, most_valuable_grid_pos_list)
@@ -456,10 +684,10 @@ class Experiment(object):
             prev_score = None
         self.draw_score(prev_score)
         self.landscape_title.draw()
-        self.win.flip()
+        self.frames.flip()
         if save_screenshot:
             self.save_screenshot('test_trial_feedback.png')
-        core.wait(self.duration_feedback)
+        self.frames.hold('feedback', self.duration_feedback)
 
     def get_clicked_gabor(self, gabors, target=None):
         if target is None:
@@ -526,14 +754,14 @@ class Experiment(object):
         text = self.make_text(self.texts['break'])
         explorer = self.make_explorer()
 
-        self.win.flip()
-        core.wait(self.duration_break_minimum)
+        self.frames.flip()
+        self.frames.hold('break_minimum', self.duration_break_minimum)
 
         title.draw()
         text.draw()
         explorer.draw()
         self.make_text(self.texts['break_complete'], pos=(0, -50))
-        self.win.flip()
+        self.frames.flip()
         event.waitKeys(['space'])
 
     def make_text(self, text, draw=True, **kwargs):
@@ -553,8 +781,10 @@ class Experiment(object):
         return text
 
     def make_explorer(self, draw=True):
-        explorer_png = path.join(pkg_root, 'img', 'explorer.png')
-        explorer = visual.ImageStim(self.win, explorer_png, pos=(0, -325), size=200)
+        if 'explorer' not in self._cache:
+            explorer_png = path.join(pkg_root, 'img', 'explorer.png')
+            self._cache['explorer'] = visual.ImageStim(self.win, explorer_png, pos=(0, -325), size=200)
+        explorer = self._cache['explorer']
         if draw:
             explorer.draw()
         return explorer
@@ -572,19 +802,49 @@ class Experiment(object):
         return self._cache['output']
 
     def write_trial(self, trial_data):
-        trial_strings = []
-        for col_name in data_columns:
-            datum = trial_data.get(col_name, '')
-            trial_strings.append(str(datum))
-        self.write_line(trial_strings)
+        self.write_line(format_trial_row(trial_data))
 
     def write_line(self, list_of_strings):
         self.output.write(','.join(list_of_strings)+'\n')
 
     def quit(self):
+        if self.chains is not None:
+            # Quit before recording instructions, so give up the lease
+            self.chains.release(self.get_var('chain'), socket.gethostname())
+            self.chains = None
+        if self.timer.records or self.timer.profiles:
+            self.write_timing_log()
+        if self.frames.records:
+            self.write_frames_log()
+        if self.memory.snapshots:
+            self.write_memory_report()
         core.quit()
         self.output.close()
 
+    def write_timing_log(self):
+        """Save the timing log and print a summary of trial phase durations."""
+        filename = path.basename(self.get_var('filename')) or 'timing.csv'
+        timing_log = path.join(TIMING_DIR, filename)
+        self.timer.write(timing_log)
+        print(self.timer.format_summary())
+        print('Saved timing log to {}'.format(timing_log))
+
+    def write_memory_report(self):
+        """Save and print the growth in memory use between blocks."""
+        filename = path.basename(self.get_var('filename')) or 'memory.csv'
+        memory_report = path.join(TIMING_DIR, path.splitext(filename)[0] + '-memory.txt')
+        self.memory.write(memory_report)
+        print(self.memory.format_report())
+        print('Saved memory report to {}'.format(memory_report))
+
+    def write_frames_log(self):
+        """Save the achieved duration of every timed screen and print a summary."""
+        filename = path.basename(self.get_var('filename')) or 'frames.csv'
+        frames_log = path.join(TIMING_DIR, path.splitext(filename)[0] + '-frames.csv')
+        self.frames.write(frames_log)
+        print(self.frames.format_summary())
+        print('Saved screen durations to {}'.format(frames_log))
+
     def get_var(self, key):
         return self.condition_vars.get(key, '')
 
@@ -615,9 +875,19 @@ class Experiment(object):
         self._cache['win'] = win
         return self._cache['win']
 
+    @property
+    def frames(self):
+        if 'frames' not in self._cache:
+            self._cache['frames'] = FrameScheduler(self.win)
+        return self._cache['frames']
+
     def use_landscape(self, name):
-        self.landscape = getattr(landscape, name)()
+        self.set_landscape(landscape.create_landscape(name))
+
+    def set_landscape(self, landscape):
+        self.landscape = landscape
         self.landscape.grating_stim_kwargs.update(self.grating_stim_kwargs)
+        self.landscape.set_sampling(self.get_var('sampling') or self.sampling)
 
     def save_screenshot(self, name):
         self.win.getMovieFrame()
@@ -0,0 +1,132 @@
+"""Hold screens for a whole number of frames.
+
+Durations are converted to frames at the measured refresh rate of the
+monitor. A screen is held by waiting until half a frame before the flip
+that ends it, so the next flip lands on the target frame no matter how
+long the wait overshoots by, and the achieved duration is measured from
+the timestamps of the flips that start and end the screen.
+"""
+import numpy
+
+
+class FrameScheduler(object):
+    """Time screens by the flips of a window.
+
+    Examples:
+
+        >>> frames = FrameScheduler(win)
+        >>> frames.measure()
+        >>> fixation.draw()
+        >>> frames.flip()
+        >>> frames.hold('fix', 1.0)
+        >>> frames.flip()  # fixation was shown for 60 frames at 60Hz
+    """
+    default_refresh_rate = 60.0
+
+    def __init__(self, win, get_time=None, wait=None):
+        if get_time is None or wait is None:
+            from psychopy import core, logging
+            get_time = get_time or logging.defaultClock.getTime  # clock of win.flip
+            wait = wait or core.wait
+        self.win = win
+        self.get_time = get_time
+        self.wait = wait
+        self.refresh_rate = None
+        self.last_flip = None
+        self.held = None
+        self.pending = None
+        self.records = []
+
+    def measure(self):
+        """Measure the refresh rate of the monitor, in Hz."""
+        refresh_rate = self.win.getActualFrameRate()
+        if refresh_rate is None:
+            print('Could not measure the refresh rate, assuming {}Hz'.format(self.default_refresh_rate))
+            refresh_rate = self.default_refresh_rate
+        self.refresh_rate = refresh_rate
+        return refresh_rate
+
+    @property
+    def frame_duration(self):
+        if self.refresh_rate is None:
+            self.measure()
+        return 1.0 / self.refresh_rate
+
+    def n_frames(self, seconds):
+        """Convert a duration to a whole number of frames, at least one."""
+        return max(1, int(round(seconds / self.frame_duration)))
+
+    def flip(self):
+        """Flip the window, ending the screen being held if there is one."""
+        if self.pending is not None:
+            name, seconds = self.pending
+            self.pending = None
+            self.hold(name, seconds)
+        flip_time = self.win.flip()
+        if flip_time is None:
+            flip_time = self.get_time()
+        if self.held is not None:
+            name, seconds, n_frames = self.held
+            self.records.append((name, seconds, n_frames * self.frame_duration,
+                                 flip_time - self.last_flip))
+            self.held = None
+        self.last_flip = flip_time
+        return flip_time
+
+    def hold(self, name, seconds):
+        """Keep the last screen up until the flip after seconds have passed.
+
+        The screen ends at the next call to flip, which should come right
+        after this returns.
+        """
+        n_frames = self.n_frames(seconds)
+        if self.last_flip is None:
+            self.last_flip = self.get_time()
+        end = self.last_flip + (n_frames - 0.5) * self.frame_duration
+        remaining = end - self.get_time()
+        if remaining > 0:
+            self.wait(remaining)
+        self.held = (name, seconds, n_frames)
+
+    def hold_until_flip(self, name, seconds):
+        """Keep the last screen up, waiting in the next flip instead of now.
+
+        The next screen can be prepared and drawn while this screen is up,
+        so the time that takes isn't added to the duration of this screen.
+        """
+        self.pending = (name, seconds)
+
+    def summarize(self):
+        """Summarize the achieved duration of each kind of screen.
+
+        Returns
+        -------
+        list of (name, n, target, mean_achieved, max_error) tuples, in
+        seconds, where target is the duration rounded to frames.
+        """
+        screens = {}
+        for name, _, target, achieved in self.records:
+            screens.setdefault(name, (target, []))[1].append(achieved)
+
+        summary = []
+        for name in sorted(screens):
+            target, achieved = screens[name]
+            achieved = numpy.array(achieved)
+            summary.append((name, len(achieved), target, achieved.mean(),
+                            numpy.abs(achieved - target).max()))
+        return summary
+
+    def format_summary(self):
+        lines = ['Screen durations at {:.1f}Hz (ms)'.format(self.refresh_rate or 0),
+                 '{:<20} {:>6} {:>9} {:>9} {:>9}'.format('screen', 'n', 'target', 'mean', 'max_err')]
+        for name, n, target, mean, max_error in self.summarize():
+            lines.append('{:<20} {:>6} {:>9.1f} {:>9.1f} {:>9.1f}'.format(
+                name, n, target*1000, mean*1000, max_error*1000))
+        return '\n'.join(lines)
+
+    def write(self, filename):
+        """Write the requested, target and achieved duration of every screen."""
+        with open(filename, 'w') as f:
+            f.write('screen,requested,target,achieved\n')
+            for record in self.records:
+                f.write('{},{:.6f},{:.6f},{:.6f}\n'.format(*record))
@@ -2,12 +2,11 @@ from os import path
 from functools import partial
 from math import sqrt
 from collections import namedtuple, OrderedDict
-from psychopy import visual
 from itertools import product
-from numpy import linspace, random, log, geomspace
-from pandas import DataFrame, read_csv
+from numpy import linspace, random, log, geomspace, array
 
 from .util import create_grid
+from .sampling import SAMPLING_MODES, sample_neighborhood
 from .score_funcs import simple_hill
 from .config import LANDSCAPE_FILES
 
@@ -27,6 +26,8 @@ class Landscape(object):
     min_sf, max_sf = 0.05, 0.2
     n_rows, n_cols = 100, 100
     grating_stim_kwargs = dict()
+    sampling = 'uniform'  # how neighborhoods are sampled, see gems.sampling
+    sampling_modes = SAMPLING_MODES
 
     def __init__(self, n_rows=None, n_cols=None, score_func=None, seed=None):
         self.n_rows = n_rows or self.n_rows
@@ -41,16 +42,19 @@ class Landscape(object):
 
         self._gems = {}
         self._scores = {}
+        self._cache = {}
 
         self.prng = random.RandomState(seed)
 
     @property
     def orientations(self):
-        return linspace(self.min_ori, self.max_ori, num=self.n_cols, endpoint=False)
+        return self.get_table('orientations', lambda self: linspace(
+            self.min_ori, self.max_ori, num=self.n_cols, endpoint=False))
 
     @property
     def spatial_frequencies(self):
-        return geomspace(self.min_sf, self.max_sf, num=self.n_rows)
+        return self.get_table('spatial_frequencies', lambda self: geomspace(
+            self.min_sf, self.max_sf, num=self.n_rows))
 
     def get(self, grid_pos):
         """Get the Gem at this position, creating it if necessary."""
@@ -66,14 +70,53 @@ class Landscape(object):
         ori_ix, sf_ix = map(int, grid_pos)
         return Gabor(self.orientations[ori_ix], self.spatial_frequencies[sf_ix])
 
+    def get_gabors(self, grid_positions):
+        """Get the features for the stimuli at many grid positions at once.
+
+        Returns
+        -------
+        Gabor of ori and sf arrays, in the order of grid_positions.
+        """
+        grid_positions = array(grid_positions, dtype=int).reshape(-1, 2)
+        return Gabor(self.orientations[grid_positions[:, 0]],
+                     self.spatial_frequencies[grid_positions[:, 1]])
+
     def get_score(self, grid_pos):
         if self.score_func is None:
             raise NotImplementedError
         return self.score_func(grid_pos)
 
+    def get_score_grid(self):
+        """Get the scores of all grid positions as an array.
+
+        The array has shape (n_rows, n_cols) and is indexed by grid position,
+        so the score at (x, y) is grid[x, y].
+        """
+        if 'score_grid' not in self._cache:
+            self._cache['score_grid'] = array([
+                [self.score((x, y)) for y in range(self.max_y)]
+                for x in range(self.max_x)
+            ])
+        return self._cache['score_grid']
+
+    def get_table(self, key, create):
+        """Get a table derived from this landscape, creating it if necessary.
+
+        Tables are created by calling create with the landscape, and are
+        cached so they are only created once per landscape.
+        """
+        if key not in self._cache:
+            self._cache[key] = create(self)
+        return self._cache[key]
+
     def to_tidy_data(self):
-        coords = [self.get((x, y)) for x, y in create_grid(*self.dims)]
-        return DataFrame.from_records(coords, columns=Gem._fields)
+        from pandas import DataFrame
+        grid_positions = array(list(create_grid(*self.dims)))
+        x, y = grid_positions.T
+        gabors = self.get_gabors(grid_positions)
+        scores = self.get_score_grid()[x, y]
+        return DataFrame(dict(x=x, y=y, ori=gabors.ori, sf=gabors.sf, score=scores),
+                         columns=Gem._fields)
 
     def export(self, filename):
         tidy_data = self.to_tidy_data()
@@ -94,21 +137,35 @@ class Landscape(object):
 
         return positions
 
+    def set_sampling(self, mode):
+        """Set how neighborhoods are sampled, one of sampling_modes."""
+        if mode not in self.sampling_modes:
+            raise ValueError("{} can't be sampled with '{}'. Modes are: {}".format(
+                type(self).__name__, mode, ', '.join(self.sampling_modes)))
+        self.sampling = mode
+
     def sample_neighborhood(self, n_sampled, grid_pos, radius):
         """Sample positions from the neighborhood."""
+        if self.sampling != 'uniform':
+            return sample_neighborhood(self.sampling, self.dims, grid_pos, radius, n_sampled, self.prng)
         positions = self.get_neighborhood(grid_pos, radius)
         self.prng.shuffle(positions)
         return positions[:n_sampled]
 
     def get_grid_of_grating_stims(self, grid_positions):
         """Returns a list of visual.GratingStim objects at these positions."""
+        grid_positions = list(grid_positions)
+        features = self.get_gabors(grid_positions)
         gabors = OrderedDict()  # retain input order of grid positions in output
-        for grid_pos in grid_positions:
-            gabors[grid_pos] = self.get_grating_stim(grid_pos)
+        for grid_pos, ori, sf in zip(grid_positions, features.ori, features.sf):
+            gabors[grid_pos] = self.create_grating_stim(Gabor(ori, sf))
         return gabors
 
     def get_grating_stim(self, grid_pos):
-        gabor = self.get_gabor(grid_pos)
+        return self.create_grating_stim(self.get_gabor(grid_pos))
+
+    def create_grating_stim(self, gabor):
+        from psychopy import visual
         return visual.GratingStim(ori=gabor.ori, sf=gabor.sf, mask='circle', **self.grating_stim_kwargs)
 
     def sample_gabors(self, n_sampled, grid_pos, radius):
@@ -149,3 +206,133 @@ class SimpleHill(Landscape):
 
     def get_score(self, grid_pos):
         return simple_hill(grid_pos, normalize=self.normalize)
+
+
+class FeatureSpaceLandscape(Landscape):
+    """A landscape of gems at irregular positions in feature space.
+
+    Positions are continuous (x, y) coordinates in grid units, so x maps
+    onto orientation and y onto spatial frequency just as on a grid, but
+    gems only exist at the given positions. Neighborhoods are found with a
+    KD-tree over the positions.
+
+    Landscapes must implement get_score or be given a score_func, which
+    are called with continuous positions. Otherwise scores can be given
+    for each position, and any other position gets the score of the
+    nearest gem.
+    """
+    decimals = 2  # positions are rounded so they can be written and read back
+    sampling_modes = ['uniform']  # sampling patterns are made for grids
+
+    def __init__(self, positions, scores=None, **kwargs):
+        from scipy.spatial import cKDTree
+
+        super(FeatureSpaceLandscape, self).__init__(**kwargs)
+        self.positions = array(positions, dtype=float).round(self.decimals)
+        self.tree = cKDTree(self.positions)
+        self.grid_positions = [tuple(pos) for pos in self.positions.tolist()]
+        self.sample_scores = None if scores is None else array(scores)
+
+    @classmethod
+    def from_jittered_grid(cls, jitter=0.25, seed=None, **kwargs):
+        """Create a landscape with a gem near each grid position."""
+        n_rows = kwargs.get('n_rows') or cls.n_rows
+        n_cols = kwargs.get('n_cols') or cls.n_cols
+        positions = create_jittered_positions(n_rows, n_cols, jitter, seed)
+        return cls(positions, seed=seed, **kwargs)
+
+    def get_gabor(self, grid_pos):
+        """Get the features for the stimuli at a continuous position."""
+        x, y = grid_pos
+        ori = self.min_ori + (self.max_ori - self.min_ori) * x / float(self.n_cols)
+        sf = self.min_sf * (self.max_sf / float(self.min_sf)) ** (y / float(self.n_rows - 1))
+        return Gabor(ori, sf)
+
+    def get_gabors(self, grid_positions):
+        """Get the features for the stimuli at many continuous positions at once."""
+        return self.get_gabor(array(grid_positions, dtype=float).reshape(-1, 2).T)
+
+    def get_score(self, grid_pos):
+        if self.sample_scores is None:
+            return super(FeatureSpaceLandscape, self).get_score(grid_pos)
+        _, nearest = self.tree.query(grid_pos)
+        return self.sample_scores[nearest]
+
+    def get_neighborhood(self, grid_pos, radius):
+        """Return a list of gem positions within radius of the given position."""
+        ixs = sorted(self.tree.query_ball_point(grid_pos, radius))
+        return [self.grid_positions[ix] for ix in ixs]
+
+    def get_nearest(self, grid_pos):
+        """Return the position of the gem nearest to the given position."""
+        _, nearest = self.tree.query(grid_pos)
+        return self.grid_positions[nearest]
+
+    def is_position_on_grid(self, grid_pos):
+        x, y = grid_pos
+        return (x >= self.min_x and x <= self.max_x - 1 and
+                y >= self.min_y and y <= self.max_y - 1)
+
+    def to_tidy_data(self):
+        from pandas import DataFrame
+        x, y = self.positions.T
+        gabors = self.get_gabors(self.positions)
+        scores = [self.score(pos) for pos in self.grid_positions]
+        return DataFrame(dict(x=x, y=y, ori=gabors.ori, sf=gabors.sf, score=scores),
+                         columns=Gem._fields)
+
+
+class JitteredSimpleHill(FeatureSpaceLandscape):
+    """A SimpleHill with each gem moved off its grid position at random."""
+    min_ori, max_ori = SimpleHill.min_ori, SimpleHill.max_ori
+    min_sf, max_sf = SimpleHill.min_sf, SimpleHill.max_sf
+    n_rows, n_cols = SimpleHill.n_rows, SimpleHill.n_cols
+    jitter = 0.4
+    jitter_seed = 100  # use the same stimulus set in every session
+
+    def __init__(self, normalize=True, **kwargs):
+        positions = create_jittered_positions(self.n_rows, self.n_cols, self.jitter, self.jitter_seed)
+        super(JitteredSimpleHill, self).__init__(positions, **kwargs)
+        self.normalize = normalize
+
+    def get_score(self, grid_pos):
+        return simple_hill(grid_pos, normalize=self.normalize)
+
+
+def require_grid_landscape(landscape, analysis):
+    """Raise a ValueError unless the gems of a landscape are on its grid.
+
+    The score grid of a FeatureSpaceLandscape scores the integer points of
+    the grid, not the positions of the gems that participants saw, so
+    analyses that look up scores in the grid can't be run on it.
+    """
+    if isinstance(landscape, FeatureSpaceLandscape):
+        raise ValueError("{} needs a landscape with gems on a grid, but the gems of {} "
+                         "are at continuous positions".format(analysis, type(landscape).__name__))
+
+
+def create_jittered_positions(n_rows, n_cols, jitter, seed=None):
+    """Move every grid position by up to jitter grid units in each dimension."""
+    prng = random.RandomState(seed)
+    grid = array(list(create_grid(n_rows, n_cols)), dtype=float)
+    positions = grid + prng.uniform(-jitter, jitter, size=grid.shape)
+    positions[:, 0] = positions[:, 0].clip(0, n_rows-1)
+    positions[:, 1] = positions[:, 1].clip(0, n_cols-1)
+    return positions
+
+
+def create_landscape(name, **kwargs):
+    """Create a landscape from the name of its class or of a spec.
+
+    Names can be the name of a Landscape subclass, the path to a spec file,
+    or the name of a spec file in the landscapes directory. See gems.specs.
+    """
+    landscape_class = globals().get(name)
+    if isinstance(landscape_class, type) and issubclass(landscape_class, Landscape):
+        return landscape_class(**kwargs)
+
+    from .specs import SpecLandscape, find_spec_file
+    spec_file = find_spec_file(name, LANDSCAPE_FILES)
+    if spec_file is None:
+        raise ValueError("Landscape '{}' not found.".format(name))
+    return SpecLandscape.from_file(spec_file, **kwargs)
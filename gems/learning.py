@@ -0,0 +1,169 @@
+"""Learning curves across the generations of transmission chains.
+
+Each session file is reduced to a small summary of the subject's
+performance, and summaries are aggregated along the inherit_from links
+between subjects. Summaries and chains are cached, so when new session
+files appear only the subjects in them and the chains they belong to are
+recomputed.
+"""
+import os
+import pickle
+
+import numpy
+
+from .config import DATA_DIR
+from .data import list_subj_files, read_subj_data
+
+
+# Bin edges for the distribution of score deltas on each trial.
+DELTA_BINS = numpy.arange(-50, 55, 5)
+
+
+def summarize_subj(trials):
+    """Summarize the performance of a single subject.
+
+    Parameters
+    ----------
+    trials: pandas.DataFrame, The trials of one subject, e.g. from
+        gems.data.read_subj_data.
+
+    Returns
+    -------
+    dict, with:
+        subj_id, generation, inherit_from
+        block_scores: mean score in each block
+        trial_scores: mean score on each trial, averaged over blocks
+        final_score: mean score on the last trial of each block
+        auc: area under the score-by-trial curve, per trial
+        delta_counts: number of deltas in each bin of DELTA_BINS
+    """
+    first = trials.iloc[0]
+    inherit_from = first.inherit_from
+    if not isinstance(inherit_from, basestring):
+        inherit_from = ''  # first generation
+
+    by_trial = trials.groupby('trial').score.mean()
+    trial_scores = by_trial.values.astype(float)
+    last_trials = trials.loc[trials.trial == trials.groupby('block_ix').trial.transform('max')]
+    delta_counts, _ = numpy.histogram(numpy.clip(trials.delta, DELTA_BINS[0], DELTA_BINS[-1]),
+                                      bins=DELTA_BINS)
+
+    return dict(
+        subj_id=first.subj_id,
+        generation=int(first.generation),
+        inherit_from=inherit_from,
+        block_scores=trials.groupby('block_ix').score.mean().values.astype(float),
+        trial_scores=trial_scores,
+        final_score=float(last_trials.score.mean()),
+        auc=float(numpy.trapz(trial_scores) / max(len(trial_scores) - 1, 1)),
+        delta_counts=delta_counts,
+    )
+
+
+def assign_chains(summaries):
+    """Find the chain of each subject by following inherit_from links.
+
+    A chain is named after its first generation. A subject that inherits
+    from a subject without data starts a chain of its own.
+
+    Returns
+    -------
+    dict of subj_id to chain name.
+    """
+    parents = {subj_id: s['inherit_from'] for subj_id, s in summaries.items()}
+    chains = {}
+    for subj_id in parents:
+        root, visited = subj_id, set()
+        while parents.get(root) in parents and root not in visited:
+            visited.add(root)
+            root = parents[root]
+        chains[subj_id] = root
+    return chains
+
+
+def summarize_chain(summaries):
+    """Aggregate the summaries of the subjects in a chain by generation.
+
+    Returns
+    -------
+    list of dicts, one per subject in order of generation, with the
+    subject's summary and cumulative delta counts for the chain.
+    """
+    rows = []
+    cumulative = numpy.zeros(len(DELTA_BINS) - 1, dtype=int)
+    for summary in sorted(summaries, key=lambda s: (s['generation'], s['subj_id'])):
+        cumulative = cumulative + summary['delta_counts']
+        row = dict(summary)
+        row['cumulative_delta_counts'] = cumulative
+        rows.append(row)
+    return rows
+
+
+class LearningCurves(object):
+    """Keep learning curves up to date as session files are added.
+
+    Examples:
+
+        >>> curves = LearningCurves(cache_file='learning.pkl')
+        >>> curves.update()
+        ['GEMS101', 'GEMS102']
+        >>> curves.to_frame()
+    """
+    def __init__(self, data_dir=DATA_DIR, cache_file=None):
+        self.data_dir = data_dir
+        self.cache_file = cache_file
+        self.subjs = {}   # filepath -> (stamp, summary)
+        self.chains = {}  # chain name -> (signature, rows)
+        if cache_file and os.path.exists(cache_file):
+            with open(cache_file, 'rb') as f:
+                self.subjs, self.chains = pickle.load(f)
+
+    def update(self):
+        """Summarize new or changed session files and their chains.
+
+        Returns
+        -------
+        list of the names of the chains that were recomputed.
+        """
+        subj_files = list_subj_files(self.data_dir)
+        for filepath in set(self.subjs) - set(subj_files):
+            del self.subjs[filepath]
+        for filepath in subj_files:
+            stat = os.stat(filepath)
+            stamp = (stat.st_mtime, stat.st_size)
+            if filepath not in self.subjs or self.subjs[filepath][0] != stamp:
+                trials = read_subj_data(filepath)
+                # Sessions that haven't finished a trial yet are summarized once they have
+                self.subjs[filepath] = (stamp, summarize_subj(trials) if len(trials) else None)
+
+        summaries = {summary['subj_id']: (stamp, summary)
+                     for stamp, summary in self.subjs.values() if summary is not None}
+        members = {}
+        for subj_id, chain in assign_chains({k: s for k, (_, s) in summaries.items()}).items():
+            members.setdefault(chain, []).append(subj_id)
+
+        updated = []
+        chains = {}
+        for chain, subj_ids in members.items():
+            signature = sorted((subj_id, summaries[subj_id][0]) for subj_id in subj_ids)
+            if chain in self.chains and self.chains[chain][0] == signature:
+                chains[chain] = self.chains[chain]
+            else:
+                rows = summarize_chain([summaries[subj_id][1] for subj_id in subj_ids])
+                chains[chain] = (signature, rows)
+                updated.append(chain)
+        self.chains = chains
+
+        if self.cache_file:
+            with open(self.cache_file, 'wb') as f:
+                pickle.dump((self.subjs, self.chains), f, protocol=pickle.HIGHEST_PROTOCOL)
+        return sorted(updated)
+
+    def to_frame(self):
+        """Tabulate the scalar summaries of every subject by chain."""
+        import pandas
+        columns = ['chain', 'generation', 'subj_id', 'inherit_from', 'final_score', 'auc']
+        records = [dict(row, chain=chain)
+                   for chain, (_, rows) in self.chains.items() for row in rows]
+        curves = pandas.DataFrame.from_records(records, columns=columns)
+        return curves.sort_values(['chain', 'generation']).reset_index(drop=True)
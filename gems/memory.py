@@ -0,0 +1,129 @@
+"""Track memory use over the blocks of an experiment session.
+
+Tracking is opt-in. At the end of each block a snapshot counts the live
+objects of each type, the live psychopy stims, and the size of the
+caches of every landscape. When tracemalloc is available (Python 3, or
+Python 2 built with pytracemalloc) snapshots also record allocations by
+source line, so growth can be traced to the lines that allocated it.
+"""
+import gc
+import sys
+from collections import Counter
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+class MemoryTracker(object):
+    """Snapshot memory use and report how it grows between snapshots.
+
+    Examples:
+
+        >>> memory = MemoryTracker(enabled=True)
+        >>> memory.snapshot('start')
+        >>> run_block()
+        >>> memory.snapshot('block1')
+        >>> print(memory.format_report())
+    """
+    n_top = 10  # growth of the top allocation sites and types to report
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.snapshots = []
+        if enabled and tracemalloc is not None and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def snapshot(self, label):
+        """Count the objects that are alive now."""
+        if not self.enabled:
+            return
+        gc.collect()
+        objects = gc.get_objects()
+        types = Counter(type(obj).__name__ for obj in objects)
+        stims = Counter(type(obj).__name__ for obj in objects
+                        if type(obj).__module__.startswith('psychopy.visual'))
+        caches = Counter()
+        for obj in objects:
+            if _is_landscape(obj):
+                caches['gems'] += len(obj._gems)
+                caches['scores'] += len(obj._scores)
+                caches['tables'] += len(obj._cache)
+        del objects
+
+        traced = tracemalloc.take_snapshot() if tracemalloc is not None else None
+        self.snapshots.append(dict(label=label, max_rss=get_max_rss(), types=types,
+                                   stims=stims, caches=caches, traced=traced))
+
+    def growth(self, before, after):
+        """Compare two snapshots.
+
+        Returns
+        -------
+        dict of the change in max_rss, the top types by growth, the change
+        in every kind of stim and cache, and, if traced, the top
+        allocation sites by growth as (site, size_diff, count_diff) tuples.
+        """
+        types = after['types'].copy()
+        types.subtract(before['types'])
+        stims = after['stims'].copy()
+        stims.subtract(before['stims'])
+        caches = after['caches'].copy()
+        caches.subtract(before['caches'])
+
+        sites = []
+        if after['traced'] is not None and before['traced'] is not None:
+            for stat in after['traced'].compare_to(before['traced'], 'lineno')[:self.n_top]:
+                frame = stat.traceback[0]
+                sites.append(('{}:{}'.format(frame.filename, frame.lineno),
+                              stat.size_diff, stat.count_diff))
+
+        return dict(max_rss=after['max_rss'] - before['max_rss'],
+                    types=[(name, n) for name, n in types.most_common(self.n_top) if n > 0],
+                    stims=sorted((name, n) for name, n in stims.items() if n != 0),
+                    caches=sorted(caches.items()),
+                    sites=sites)
+
+    def format_report(self):
+        lines = ['Memory growth between snapshots']
+        if tracemalloc is None:
+            lines.append('(tracemalloc is unavailable, so growth is reported by type)')
+        for before, after in zip(self.snapshots, self.snapshots[1:]):
+            growth = self.growth(before, after)
+            lines.append('')
+            lines.append('{} -> {}: max rss {:+.1f} MB'.format(
+                before['label'], after['label'], growth['max_rss'] / 1024.0**2))
+            lines.append('  live stims: ' + _format_counts(growth['stims']))
+            lines.append('  landscape caches: ' + _format_counts(growth['caches']))
+            for name, n in growth['types']:
+                lines.append('  {:>+10} {}'.format(n, name))
+            for site, size_diff, count_diff in growth['sites']:
+                lines.append('  {:>+10.1f} KB {:>+8} blocks  {}'.format(size_diff / 1024.0, count_diff, site))
+        return '\n'.join(lines)
+
+    def write(self, filename):
+        with open(filename, 'w') as f:
+            f.write(self.format_report() + '\n')
+
+
+def get_max_rss():
+    """Get the peak resident memory of this process in bytes."""
+    try:
+        import resource
+    except ImportError:
+        return 0  # windows
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def _is_landscape(obj):
+    from .landscape import Landscape
+    try:
+        return isinstance(obj, Landscape)
+    except ReferenceError:
+        return False  # dead weakref proxy
+
+
+def _format_counts(counts):
+    return ', '.join('{} {:+}'.format(name, n) for name, n in counts) or 'no change'
@@ -0,0 +1,147 @@
+"""Watch the progress of sessions while they are running.
+
+Session files are tailed: each poll reads only the bytes that were
+appended since the last poll, and files that haven't grown are not
+opened at all, so the monitor can run on a lab machine next to the
+experiment.
+"""
+import time
+from glob import glob
+from os import path
+
+import numpy
+
+from .config import DATA_DIR
+
+
+class SessionTail(object):
+    """Parse the trials appended to a session file since the last read."""
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.offset = 0
+        self.partial = ''
+        self.columns = None
+
+    def read_new(self):
+        """Read the complete lines appended since the last read.
+
+        Returns
+        -------
+        list of dicts, one per new trial.
+        """
+        size = path.getsize(self.filepath)
+        if size < self.offset:
+            self.__init__(self.filepath)  # file was rewritten
+        if size == self.offset:
+            return []
+
+        with open(self.filepath) as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+        self.offset += len(chunk)
+
+        lines = (self.partial + chunk).split('\n')
+        self.partial = lines.pop()  # incomplete until it ends in a newline
+
+        rows = []
+        for line in lines:
+            values = line.split(',')
+            if self.columns is None:
+                self.columns = values
+            elif len(values) == len(self.columns):
+                rows.append(dict(zip(self.columns, values)))
+        return rows
+
+
+class SessionStats(object):
+    """Running stats for a single session."""
+    def __init__(self, subj_id):
+        self.subj_id = subj_id
+        self.computer = ''
+        self.block_ix = ''
+        self.trial = ''
+        self.score = ''
+        self.rts = []
+        self.n_trials = 0
+        self.last_update = time.time()
+
+    def add(self, row, now):
+        self.computer = row['computer']
+        self.block_ix = row['block_ix']
+        self.trial = row['trial']
+        self.score = row['score']
+        try:
+            self.rts.append(float(row['rt']))
+        except ValueError:
+            pass
+        self.n_trials += 1
+        self.last_update = now
+
+    @property
+    def median_rt(self):
+        return numpy.median(self.rts) if self.rts else float('nan')
+
+
+class Monitor(object):
+    """Keep running stats for every session file in the data directory.
+
+    Parameters
+    ----------
+    data_dir: str, Directory of the session files.
+    stall_seconds: float, Sessions without a new trial for this long are
+        reported as stalled.
+    """
+    def __init__(self, data_dir=DATA_DIR, stall_seconds=60):
+        self.data_dir = data_dir
+        self.stall_seconds = stall_seconds
+        self.tails = {}
+        self.sessions = {}
+
+    def poll(self, now=None):
+        """Read new trials from every session file.
+
+        Returns
+        -------
+        int, the number of new trials.
+        """
+        if now is None:
+            now = time.time()
+        n_new = 0
+        for filepath in glob(path.join(self.data_dir, 'GEMS*.csv')):
+            if filepath not in self.tails:
+                self.tails[filepath] = SessionTail(filepath)
+                subj_id = path.splitext(path.basename(filepath))[0]
+                self.sessions[filepath] = SessionStats(subj_id)
+            for row in self.tails[filepath].read_new():
+                self.sessions[filepath].add(row, now)
+                n_new += 1
+        return n_new
+
+    def is_stalled(self, session, now):
+        return now - session.last_update > self.stall_seconds
+
+    def active_sessions(self, max_age):
+        """List the sessions that have written a trial in the last max_age seconds."""
+        now = time.time()
+        return [s for s in self.sessions.values() if now - s.last_update < max_age]
+
+    def format_status(self, sessions, now=None):
+        if now is None:
+            now = time.time()
+        header = '{:<10} {:<10} {:>6} {:>6} {:>6} {:>8}  {}'.format(
+            'station', 'subj_id', 'block', 'trial', 'score', 'rt', 'status')
+        lines = [header]
+        for s in sorted(sessions, key=lambda s: (s.computer, s.subj_id)):
+            status = 'stalled {:.0f}s'.format(now - s.last_update) if self.is_stalled(s, now) else ''
+            lines.append('{:<10} {:<10} {:>6} {:>6} {:>6} {:>8.2f}  {}'.format(
+                s.computer, s.subj_id, s.block_ix, s.trial, s.score, s.median_rt, status))
+        return '\n'.join(lines)
+
+    def run(self, interval=2.0, max_age=60*60):
+        """Poll the session files and print their status until interrupted."""
+        self.poll(now=0)  # sessions finished before the monitor started aren't active
+        while True:
+            time.sleep(interval)
+            self.poll()
+            print('\n' + time.strftime('%H:%M:%S'))
+            print(self.format_status(self.active_sessions(max_age)))
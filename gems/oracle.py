@@ -0,0 +1,78 @@
+"""Compare each choice to the best choices that were available.
+
+For every trial, the score of the selected gem is compared to the best of
+the gems that were shown, the best gem within sight_radius of the current
+position, and the best gem on the whole landscape. The best gem in sight
+is read from a precomputed table of the maximum score within radius of
+every grid position, so only landscapes with gems on a grid are supported.
+"""
+import numpy
+from scipy.ndimage import maximum_filter
+
+from .landscape import create_landscape, require_grid_landscape
+from .util import create_neighborhood_offsets, parse_pos_column, parse_pos_list_column, pos_to_code
+
+
+def get_radius_max_grid(landscape, radius):
+    """Get the maximum score within radius of every grid position.
+
+    Returns
+    -------
+    (n_rows, n_cols) array, cached on the landscape.
+    """
+    def create(landscape):
+        grid = landscape.get_score_grid()
+        offsets = create_neighborhood_offsets(radius)
+        footprint = numpy.zeros((2*radius+1, 2*radius+1), dtype=bool)
+        footprint[offsets[:, 0]+radius, offsets[:, 1]+radius] = True
+        return maximum_filter(grid, footprint=footprint, mode='constant', cval=grid.min())
+    return landscape.get_table(('radius_max', radius), create)
+
+
+def add_oracle_metrics(trials):
+    """Add the best available scores and the regret of every choice.
+
+    Parameters
+    ----------
+    trials: pandas.DataFrame, Trials in the format of config.data_columns.
+
+    Returns
+    -------
+    pandas.DataFrame, a copy of trials with the columns:
+        best_stim_score: best score among the gems that were shown
+        best_sight_score: best score within sight_radius of pos
+        global_max_score: best score on the landscape
+        stim_regret, sight_regret, global_regret: the difference between
+            each of the above and the score of the selected gem
+    """
+    trials = trials.copy()
+    pos = parse_pos_column(trials.pos)
+    stims = parse_pos_list_column(trials.stims)
+
+    best_stim_score = numpy.full(len(trials), numpy.nan)
+    best_sight_score = numpy.full(len(trials), numpy.nan)
+    global_max_score = numpy.full(len(trials), numpy.nan)
+
+    landscapes = {}
+    groups = trials.groupby(['landscape_name', 'sight_radius']).indices
+    for (name, radius), ix in groups.items():
+        if name not in landscapes:
+            landscapes[name] = create_landscape(name)
+            require_grid_landscape(landscapes[name], 'add_oracle_metrics')
+        landscape = landscapes[name]
+        grid = landscape.get_score_grid()
+
+        stim_codes = pos_to_code(stims[ix], grid.shape)
+        stim_scores = numpy.where(stim_codes >= 0, grid.ravel()[stim_codes], -numpy.inf)
+        best_stim_score[ix] = stim_scores.max(axis=1)
+        radius_max = get_radius_max_grid(landscape, int(radius)).ravel()
+        best_sight_score[ix] = radius_max[pos_to_code(pos[ix], grid.shape)]
+        global_max_score[ix] = grid.max()
+
+    trials['best_stim_score'] = best_stim_score
+    trials['best_sight_score'] = best_sight_score
+    trials['global_max_score'] = global_max_score
+    trials['stim_regret'] = best_stim_score - trials.score
+    trials['sight_regret'] = best_sight_score - trials.score
+    trials['global_regret'] = global_max_score - trials.score
+    return trials
@@ -0,0 +1,113 @@
+"""Downsampled score grids for coarse-to-fine search and plotting.
+
+Level 0 of a pyramid is the score grid of the landscape, and each level
+above pools blocks of factor x factor cells of the level below, so the
+cell (i, j) at level k covers the grid positions from (i, j) * factor**k
+up to but not including (i+1, j+1) * factor**k. Pyramids are cached on
+the landscape with get_table.
+"""
+import numpy
+
+
+def get_pyramid(landscape, pool='max', factor=2):
+    """Get the score grids of a landscape at every level of resolution.
+
+    Parameters
+    ----------
+    pool: str, "max" or "mean", How blocks of cells are pooled. With max
+        pooling each cell is the best score in its block, so regions can
+        be pruned without missing the best position.
+    factor: int, Number of cells pooled along each dimension per level.
+
+    Returns
+    -------
+    list of float arrays, from the full score grid to a single cell.
+    """
+    if pool not in ('max', 'mean'):
+        raise ValueError("pool must be 'max' or 'mean'")
+
+    def create(landscape):
+        grid = landscape.get_score_grid().astype(float)
+        levels = [grid]
+        while max(levels[-1].shape) > 1:
+            levels.append(_pool(grid, pool, factor**len(levels)))
+        return levels
+    return landscape.get_table(('pyramid', pool, factor), create)
+
+
+def _pool(grid, pool, size):
+    """Pool blocks of size x size cells, ignoring the padding of edge blocks."""
+    n_rows, n_cols = grid.shape
+    pad = [(0, -n_rows % size), (0, -n_cols % size)]
+    if pool == 'max':
+        padded = numpy.pad(grid, pad, mode='constant', constant_values=-numpy.inf)
+        return _blocks(padded, size).max(axis=(1, 3))
+    sums = _blocks(numpy.pad(grid, pad, mode='constant'), size).sum(axis=(1, 3))
+    counts = _blocks(numpy.pad(numpy.ones_like(grid), pad, mode='constant'), size).sum(axis=(1, 3))
+    return sums / counts
+
+
+def _blocks(padded, size):
+    return padded.reshape(padded.shape[0] // size, size, padded.shape[1] // size, size)
+
+
+def to_level(positions, level, factor=2):
+    """Map grid positions to the cells that contain them at a level."""
+    return numpy.asarray(positions) // factor**level
+
+
+def from_level(cells, level, factor=2):
+    """Map cells at a level to the first grid position in each cell."""
+    return numpy.asarray(cells) * factor**level
+
+
+def get_cell_slices(cell, level, dims, factor=2):
+    """Get the slices of the score grid that a cell at a level covers."""
+    size = factor**level
+    return tuple(slice(i * size, min((i + 1) * size, n)) for i, n in zip(cell, dims))
+
+
+def choose_level(landscape, max_cells, factor=2):
+    """Choose the finest level of a pyramid with at most max_cells cells."""
+    n_rows, n_cols = landscape.dims
+    level = 0
+    while n_rows * n_cols > max_cells and max(n_rows, n_cols) > 1:
+        n_rows, n_cols = -(-n_rows // factor), -(-n_cols // factor)
+        level += 1
+    return level
+
+
+def get_cell_centers(level, dims, factor=2):
+    """Get the grid coordinates of the centers of the cells at a level.
+
+    Returns
+    -------
+    (x, y) arrays of the centers along each dimension, for plotting a
+    level in the same coordinates as the full score grid.
+    """
+    size = factor**level
+    return tuple(numpy.minimum(numpy.arange(0, n, size) + (size - 1) / 2.0, n - 1) for n in dims)
+
+
+def find_best_positions(landscape, threshold, factor=2):
+    """Find every grid position with a score of at least threshold.
+
+    Search starts at the top of the max pyramid and only descends into
+    cells whose best score reaches threshold, so most of a landscape is
+    pruned without looking at its positions.
+
+    Returns
+    -------
+    (n_positions, 2) int array of grid positions, sorted.
+    """
+    levels = get_pyramid(landscape, 'max', factor)
+    cells = numpy.zeros((1, 2), dtype=int)
+    offsets = numpy.array([(i, j) for i in range(factor) for j in range(factor)])
+    for level in range(len(levels) - 1, -1, -1):
+        grid = levels[level]
+        on_grid = (cells[:, 0] < grid.shape[0]) & (cells[:, 1] < grid.shape[1])
+        cells = cells[on_grid]
+        cells = cells[grid[cells[:, 0], cells[:, 1]] >= threshold]
+        if level > 0:
+            cells = (cells[:, numpy.newaxis, :] * factor + offsets).reshape(-1, 2)
+    return cells[numpy.lexsort((cells[:, 1], cells[:, 0]))]
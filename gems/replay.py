@@ -0,0 +1,98 @@
+"""Replay recorded trajectories against their landscapes.
+
+Scores and deltas are recomputed from the score grid of each landscape for
+all trials at once, and every trial is checked for consistency with the
+rules of the experiment.
+"""
+import numpy
+
+from .landscape import create_landscape, require_grid_landscape
+from .util import parse_pos_column, parse_pos_list_column, pos_to_code
+
+
+# Checks that are run on every trial, in the order they are reported.
+FLAGS = [
+    'pos_not_continuous',
+    'selected_not_in_stims',
+    'stims_outside_radius',
+    'stims_off_grid',
+    'starting_score_mismatch',
+    'score_mismatch',
+    'delta_mismatch',
+]
+
+
+def replay(trials):
+    """Recompute scores and flag trials that disagree with the landscape.
+
+    Parameters
+    ----------
+    trials: pandas.DataFrame, Trials in the format of config.data_columns,
+        e.g. from gems.data.load_data.
+
+    Returns
+    -------
+    pandas.DataFrame, a copy of trials sorted by subject, block and trial,
+    with the recomputed expected_starting_score, expected_score and
+    expected_delta, a boolean column for each check in FLAGS, and
+    "valid" which is True if no checks failed.
+    """
+    trials = trials.sort_values(['subj_id', 'block_ix', 'trial']).reset_index(drop=True)
+
+    starting_pos = parse_pos_column(trials.starting_pos)
+    pos = parse_pos_column(trials.pos)
+    selected = parse_pos_column(trials.selected)
+    stims = parse_pos_list_column(trials.stims)
+    is_stim = (stims >= 0).all(axis=2)
+
+    # Each trial starts where the previous trial in the block ended
+    same_block = ((trials.subj_id == trials.subj_id.shift()) &
+                  (trials.block_ix == trials.block_ix.shift())).values
+    expected_pos = starting_pos.copy()
+    expected_pos[same_block] = selected[numpy.flatnonzero(same_block) - 1]
+    trials['pos_not_continuous'] = (pos != expected_pos).any(axis=1)
+
+    matches_selected = (stims == selected[:, numpy.newaxis, :]).all(axis=2)
+    trials['selected_not_in_stims'] = ~(matches_selected & is_stim).any(axis=1)
+
+    sq_dist = ((stims - pos[:, numpy.newaxis, :])**2).sum(axis=2)
+    sq_radius = (trials.sight_radius.values**2)[:, numpy.newaxis]
+    trials['stims_outside_radius'] = ((sq_dist > sq_radius) & is_stim).any(axis=1)
+
+    expected_starting_score = numpy.full(len(trials), numpy.nan)
+    expected_score = numpy.full(len(trials), numpy.nan)
+    prev_score = numpy.full(len(trials), numpy.nan)
+    stims_off_grid = numpy.zeros(len(trials), dtype=bool)
+
+    for name, ix in trials.groupby('landscape_name').indices.items():
+        landscape = create_landscape(name)
+        require_grid_landscape(landscape, 'replay')
+        grid = landscape.get_score_grid()
+        stims_off_grid[ix] = ((pos_to_code(stims[ix], grid.shape) < 0) & is_stim[ix]).any(axis=1)
+        expected_starting_score[ix] = _lookup(grid, starting_pos[ix])
+        expected_score[ix] = _lookup(grid, selected[ix])
+        prev_score[ix] = _lookup(grid, pos[ix])
+
+    trials['stims_off_grid'] = stims_off_grid
+    trials['expected_starting_score'] = expected_starting_score
+    trials['expected_score'] = expected_score
+    trials['expected_delta'] = expected_score - prev_score
+
+    trials['starting_score_mismatch'] = ~numpy.isclose(trials.starting_score, expected_starting_score)
+    trials['score_mismatch'] = ~numpy.isclose(trials.score, expected_score)
+    trials['delta_mismatch'] = ~numpy.isclose(trials.delta, trials.expected_delta)
+
+    trials['valid'] = ~trials[FLAGS].any(axis=1)
+    return trials
+
+
+def summarize_flags(replayed):
+    """Count the number of failed checks per subject."""
+    flags = replayed.groupby('subj_id')[FLAGS].sum().astype(int)
+    return flags.loc[flags.sum(axis=1) > 0]
+
+
+def _lookup(grid, positions):
+    """Get scores at positions, with NaN for positions off the grid."""
+    codes = pos_to_code(positions, grid.shape)
+    return numpy.where(codes >= 0, grid.ravel()[codes], numpy.nan)
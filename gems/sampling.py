@@ -0,0 +1,192 @@
+"""Spread the gems sampled from a neighborhood over the whole neighborhood.
+
+A uniform sample of a neighborhood often puts several gems next to each
+other, so the choices on a trial are nearly redundant. The other ways of
+sampling draw from patterns that are precomputed once for every radius
+and number of samples, and are applied on each trial by a random
+rotation or reflection, so a trial costs about the same as shuffling the
+neighborhood.
+
+Modes
+-----
+
+uniform: Shuffle the neighborhood and take the first positions.
+stratified: Divide the neighborhood into sectors of equal angle, and
+    sample one position from each sector. Sectors alternate between the
+    inner and outer halves of the neighborhood by area, so samples are
+    spread over distance as well as direction.
+poisson: Sample a Poisson-disk pattern, a set of positions that are all
+    at least a minimum distance apart.
+
+The current position is never sampled by the stratified and poisson
+modes. Positions of a pattern that fall off the grid are replaced by
+positions drawn uniformly from the rest of the neighborhood.
+"""
+import numpy
+
+from .util import create_neighborhood_offsets
+
+
+SAMPLING_MODES = ['uniform', 'stratified', 'poisson']
+
+n_rotations = 24  # rotations of the sectors of a stratified pattern
+n_patterns = 64   # poisson-disk patterns for each radius and number of samples
+max_tries = 4     # poisson-disk patterns to try before filling off-grid positions
+
+# Integer rotations and reflections of a pattern, as (swap, sign_x, sign_y)
+SYMMETRIES = [(swap, sign_x, sign_y) for swap in (False, True)
+              for sign_x in (1, -1) for sign_y in (1, -1)]
+
+_tables = {}  # (mode, radius, n_sampled) -> pattern table
+
+
+def get_table(mode, radius, n_sampled):
+    """Get the pattern table for a mode, creating it if necessary."""
+    key = (mode, radius, n_sampled)
+    if key not in _tables:
+        create = dict(stratified=create_stratified_table, poisson=create_poisson_table)[mode]
+        _tables[key] = create(radius, n_sampled)
+    return _tables[key]
+
+
+def create_stratified_table(radius, n_sampled):
+    """Assign the offsets of a neighborhood to strata at every rotation.
+
+    Returns
+    -------
+    (offsets, strata), where offsets is an (n_offsets, 2) int array and
+    strata is an (n_rotations, n_offsets) int array of the stratum of each
+    offset at each rotation, or -1 for offsets that aren't sampled.
+    """
+    offsets = create_neighborhood_offsets(radius)
+    dx, dy = offsets.T
+    angles = numpy.arctan2(dy, dx) % (2 * numpy.pi)
+    outer = (dx**2 + dy**2) > radius**2 / 2.0  # halves of equal area
+    sector_width = 2 * numpy.pi / n_sampled
+    rotations = numpy.arange(n_rotations) * sector_width / n_rotations
+
+    strata = ((angles - rotations[:, numpy.newaxis]) % (2 * numpy.pi) // sector_width).astype(int)
+    strata = numpy.minimum(strata, n_sampled - 1)  # guard against rounding at 2 pi
+    if n_sampled > 1:
+        strata[(strata % 2 == 1) != outer] = -1
+    strata[:, (dx == 0) & (dy == 0)] = -1
+    return offsets, strata
+
+
+def create_poisson_table(radius, n_sampled, seed=0):
+    """Create Poisson-disk patterns of offsets by dart throwing.
+
+    The minimum distance starts at the spacing of n_sampled points packed
+    in a hexagonal grid over the neighborhood, and shrinks until every
+    pattern can be completed.
+
+    Returns
+    -------
+    (n_patterns, n_sampled, 2) int array of offsets.
+    """
+    prng = numpy.random.RandomState([seed, radius, n_sampled])
+    offsets = create_neighborhood_offsets(radius)
+    offsets = offsets[(offsets != 0).any(axis=1)]
+    n_sampled = min(n_sampled, len(offsets))
+    min_distance = radius * numpy.sqrt(2 * numpy.pi / (numpy.sqrt(3) * n_sampled))
+
+    patterns = []
+    while len(patterns) < n_patterns:
+        pattern = _throw_darts(offsets, n_sampled, min_distance, prng)
+        if pattern is None:
+            min_distance *= 0.9
+            continue
+        patterns.append(pattern)
+    return numpy.array(patterns)
+
+
+def _throw_darts(offsets, n_sampled, min_distance, prng, max_darts=200):
+    chosen = []
+    for ix in prng.randint(len(offsets), size=max_darts):
+        dart = offsets[ix]
+        if all(((dart - other)**2).sum() >= min_distance**2 for other in chosen):
+            chosen.append(dart)
+            if len(chosen) == n_sampled:
+                return numpy.array(chosen)
+
+
+def sample_neighborhood(mode, dims, grid_pos, radius, n_sampled, prng):
+    """Sample positions from a neighborhood on a grid.
+
+    Parameters
+    ----------
+    mode: str, One of SAMPLING_MODES other than "uniform".
+    dims: (n_rows, n_cols) of the grid.
+    prng: numpy.random.RandomState, e.g. the prng of the landscape.
+
+    Returns
+    -------
+    list of up to n_sampled (x, y) grid positions, in random order.
+    """
+    if mode == 'stratified':
+        positions = _sample_stratified(dims, grid_pos, radius, n_sampled, prng)
+    elif mode == 'poisson':
+        positions = _sample_poisson(dims, grid_pos, radius, n_sampled, prng)
+    else:
+        raise ValueError("Unknown sampling mode '{}'. Modes are: {}".format(
+            mode, ', '.join(SAMPLING_MODES)))
+    prng.shuffle(positions)
+    return [tuple(pos) for pos in positions.tolist()]
+
+
+def _sample_stratified(dims, grid_pos, radius, n_sampled, prng):
+    offsets, strata = get_table('stratified', radius, n_sampled)
+    stratum = strata[prng.randint(len(strata))]
+    positions = numpy.asarray(grid_pos) + offsets
+    on_grid = _is_on_grid(positions, dims)
+
+    # Sort the sampled offsets by stratum and at random within each stratum
+    ixs = numpy.flatnonzero(on_grid & (stratum >= 0))
+    ixs = ixs[numpy.lexsort((prng.random_sample(len(ixs)), stratum[ixs]))]
+    first = numpy.ones(len(ixs), dtype=bool)
+    first[1:] = stratum[ixs][1:] != stratum[ixs][:-1]
+    chosen = ixs[first]
+
+    if len(chosen) < n_sampled:  # strata off the grid
+        on_grid[chosen] = False
+        on_grid[(offsets == 0).all(axis=1)] = False
+        chosen = numpy.concatenate([chosen, _fill(on_grid, n_sampled - len(chosen), prng)])
+    return positions[chosen]
+
+
+def _sample_poisson(dims, grid_pos, radius, n_sampled, prng):
+    patterns = get_table('poisson', radius, n_sampled)
+    best, best_count = None, -1
+    for _ in range(max_tries):
+        pattern = _transform(patterns[prng.randint(len(patterns))], SYMMETRIES[prng.randint(len(SYMMETRIES))])
+        positions = numpy.asarray(grid_pos) + pattern
+        on_grid = _is_on_grid(positions, dims)
+        if on_grid.all():
+            return positions
+        if on_grid.sum() > best_count:
+            best, best_count = positions[on_grid], on_grid.sum()
+
+    # Replace the positions that are off the grid
+    offsets = create_neighborhood_offsets(radius)
+    neighborhood = numpy.asarray(grid_pos) + offsets
+    available = _is_on_grid(neighborhood, dims) & (offsets != 0).any(axis=1)
+    available &= ~(neighborhood[:, numpy.newaxis, :] == best).all(axis=2).any(axis=1)
+    fill = _fill(available, n_sampled - len(best), prng)
+    return numpy.concatenate([best, neighborhood[fill]])
+
+
+def _transform(pattern, symmetry):
+    swap, sign_x, sign_y = symmetry
+    if swap:
+        pattern = pattern[:, ::-1]
+    return pattern * (sign_x, sign_y)
+
+
+def _fill(available, n, prng):
+    ixs = numpy.flatnonzero(available)
+    prng.shuffle(ixs)
+    return ixs[:n]
+
+
+def _is_on_grid(positions, dims):
+    return ((positions >= 0) & (positions < dims)).all(axis=1)
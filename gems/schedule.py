@@ -0,0 +1,67 @@
+"""Prepare the landscape for every block of a session in the background."""
+import sys
+import threading
+from timeit import default_timer
+
+from .landscape import create_landscape
+
+
+class LandscapeSchedule(object):
+    """Build the landscape for each block on a background thread.
+
+    Landscapes are built in block order while the participant reads the
+    instructions, so getting the landscape for a block only waits if the
+    block starts before its landscape is ready. Window resources such as
+    GratingStims can only be created on the main thread, so the landscape
+    and its score grid are built here, and stims are created when they are
+    shown.
+
+    Examples:
+
+        >>> schedule = LandscapeSchedule(['SimpleHill', 'SimpleHill'])
+        >>> schedule.start()
+        >>> landscape = schedule.get(0)
+    """
+
+    def __init__(self, landscape_names):
+        self.landscape_names = list(landscape_names)
+        self.build_times = [None] * len(self.landscape_names)
+        self._landscapes = [None] * len(self.landscape_names)
+        self._errors = [None] * len(self.landscape_names)
+        self._ready = [threading.Event() for _ in self.landscape_names]
+        self._thread = None
+
+    def __len__(self):
+        return len(self.landscape_names)
+
+    def start(self):
+        """Start building the landscapes in the background."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.build_all, name='LandscapeSchedule')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def build_all(self):
+        for block_ix, name in enumerate(self.landscape_names):
+            start = default_timer()
+            try:
+                self._landscapes[block_ix] = self.build(name)
+            except Exception:
+                self._errors[block_ix] = sys.exc_info()
+            self.build_times[block_ix] = default_timer() - start
+            self._ready[block_ix].set()
+
+    def build(self, name):
+        """Create a landscape and precompute its scores."""
+        landscape = create_landscape(name)
+        landscape.get_score_grid()
+        return landscape
+
+    def get(self, block_ix):
+        """Get the landscape for a block, waiting for it if necessary."""
+        self.start()
+        self._ready[block_ix].wait()
+        if self._errors[block_ix] is not None:
+            exc_type, exc_value, tb = self._errors[block_ix]
+            raise exc_type, exc_value, tb
+        return self._landscapes[block_ix]
@@ -0,0 +1,151 @@
+"""Sync tables of values to a spreadsheet in as few requests as possible.
+
+The last values synced to a worksheet are cached in a local snapshot.
+Changes are diffed against the snapshot, and only the cells that changed
+are sent, all in a single batched update. Worksheets are accessed through
+a backend, so a local csv file can stand in for a Google Sheet when
+testing or working offline.
+"""
+import csv
+import json
+import re
+from os import path
+
+
+def parse_a1(label):
+    """Convert an A1-style cell label to a (row, col) pair, 1-indexed."""
+    match = re.match(r'^([A-Z]+)(\d+)$', label.upper())
+    if match is None:
+        raise ValueError("'{}' is not a cell label".format(label))
+    letters, row = match.groups()
+    col = 0
+    for letter in letters:
+        col = col * 26 + (ord(letter) - ord('A') + 1)
+    return int(row), col
+
+
+class GspreadBackend(object):
+    """Read and write a Google Sheets worksheet with gspread."""
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def get_all_values(self):
+        return self.worksheet.get_all_values()
+
+    def update_cells(self, cells):
+        from gspread import Cell
+        self.worksheet.update_cells([Cell(row, col, value) for row, col, value in cells])
+
+
+class LocalSheetBackend(object):
+    """Read and write a csv file as if it were a worksheet."""
+    def __init__(self, filename):
+        self.filename = filename
+        self.n_updates = 0
+
+    def get_all_values(self):
+        if not path.exists(self.filename):
+            return []
+        with open(self.filename) as f:
+            return [row for row in csv.reader(f)]
+
+    def update_cells(self, cells):
+        values = self.get_all_values()
+        for row, col, value in cells:
+            _set_cell(values, row, col, value)
+        with open(self.filename, 'w') as f:
+            csv.writer(f, lineterminator='\n').writerows(values)
+        self.n_updates += 1
+
+
+class SheetSync(object):
+    """Send only the cells that changed since the last sync.
+
+    Examples:
+
+        >>> sync = SheetSync(GspreadBackend(ws), 'subj-info.json')
+        >>> sync.set_column('D2', ['orientation', 'spatial_frequency'])
+        >>> sync.push()
+    """
+    def __init__(self, backend, snapshot_file=None):
+        self.backend = backend
+        self.snapshot_file = snapshot_file
+        self.staged = {}
+        self._snapshot = None
+
+    @property
+    def snapshot(self):
+        """The values in the worksheet as of the last sync."""
+        if self._snapshot is None:
+            if self.snapshot_file and path.exists(self.snapshot_file):
+                with open(self.snapshot_file) as f:
+                    self._snapshot = json.load(f)
+            else:
+                self.pull()
+        return self._snapshot
+
+    def pull(self):
+        """Replace the snapshot with the current values in the worksheet."""
+        self._snapshot = self.backend.get_all_values()
+        self.save_snapshot()
+
+    def save_snapshot(self):
+        if self.snapshot_file:
+            with open(self.snapshot_file, 'w') as f:
+                json.dump(self._snapshot, f)
+
+    def get(self, row, col):
+        try:
+            return self.snapshot[row-1][col-1]
+        except IndexError:
+            return ''
+
+    def set(self, row, col, value):
+        self.staged[(row, col)] = '' if value is None else str(value)
+
+    def set_column(self, start, values):
+        """Stage values in a column, starting at an A1-style cell label."""
+        row, col = parse_a1(start)
+        for i, value in enumerate(values):
+            self.set(row + i, col, value)
+
+    def set_row(self, start, values):
+        """Stage values in a row, starting at an A1-style cell label."""
+        row, col = parse_a1(start)
+        for i, value in enumerate(values):
+            self.set(row, col + i, value)
+
+    def diff(self):
+        """List the staged cells that differ from the snapshot.
+
+        Returns
+        -------
+        list of (row, col, value) tuples, sorted by row and col.
+        """
+        return sorted((row, col, value) for (row, col), value in self.staged.items()
+                      if self.get(row, col) != value)
+
+    def push(self):
+        """Send the staged cells that changed in a single update.
+
+        Returns
+        -------
+        list of the (row, col, value) cells that were sent.
+        """
+        changed = self.diff()
+        if changed:
+            self.backend.update_cells(changed)
+            for row, col, value in changed:
+                _set_cell(self.snapshot, row, col, value)
+            self.save_snapshot()
+        self.staged = {}
+        return changed
+
+
+def _set_cell(values, row, col, value):
+    """Set a cell in a list of rows, padding the rows as needed."""
+    while len(values) < row:
+        values.append([])
+    while len(values[row-1]) < col:
+        values[row-1].append('')
+    values[row-1][col-1] = value
@@ -0,0 +1,263 @@
+"""Simulate a population of explorers on a landscape.
+
+Every simulated explorer is advanced on each trial with array operations
+over the agent axis, so large populations can be run without a window.
+
+Examples:
+
+    >>> from gems import SimpleHill
+    >>> from gems.simulation import simulate
+    >>> trajectories = simulate(SimpleHill(), n_agents=100000, n_trials=40,
+    ...                         sight_radius=10, n_gabors=6, seed=100)
+    >>> trajectories.score[-1].mean()
+"""
+from collections import namedtuple, OrderedDict
+from itertools import product
+from multiprocessing import Pool, cpu_count
+
+import numpy
+
+from .landscape import create_landscape
+from .util import create_neighborhood_offsets
+
+
+Trajectories = namedtuple('Trajectories', 'pos stims selected score delta')
+
+SWEEP_PARAMETERS = ['landscape_name', 'sight_radius', 'n_gabors', 'n_trials_per_block']
+
+
+def simulate(landscape, n_agents, n_trials, sight_radius, n_gabors,
+             strategy='greedy', starting_pos=(0, 0), seed=None,
+             keep_stims=True, **strategy_kwargs):
+    """Simulate explorers that each pick one of the sampled gems per trial.
+
+    Parameters
+    ----------
+    landscape: gems.Landscape, The landscape to explore.
+    n_agents: int, Number of explorers simulated in parallel.
+    n_trials: int, Number of trials to run.
+    sight_radius: int, Range of sight on the grid.
+    n_gabors: int, Number of gems sampled on each trial.
+    strategy: str, One of "greedy", "softmax" or "noisy". See STRATEGIES.
+    starting_pos: tuple or (n_agents, 2) array, Starting grid positions.
+    seed: int, Seed for the random number generator.
+    keep_stims: bool, Should the sampled gems be kept? Dropping them saves
+        memory in very large simulations.
+    strategy_kwargs: Passed on to the selection strategy, e.g.
+        temperature for "softmax" or noise for "noisy".
+
+    Returns
+    -------
+    Trajectories, with pos, selected (n_trials, n_agents, 2), stims
+    (n_trials, n_agents, n_gabors, 2) or None, and score and delta
+    (n_trials, n_agents) arrays.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError("strategy must be one of {}".format(sorted(STRATEGIES)))
+    select = STRATEGIES[strategy]
+
+    prng = numpy.random.RandomState(seed)
+    grid = landscape.get_score_grid()
+    offsets = create_neighborhood_offsets(sight_radius)
+    pos_dtype = numpy.min_scalar_type(-max(grid.shape))
+
+    pos = numpy.empty((n_agents, 2), dtype=numpy.intp)
+    pos[:] = starting_pos
+
+    trajectories = Trajectories(
+        pos=numpy.empty((n_trials, n_agents, 2), dtype=pos_dtype),
+        stims=numpy.empty((n_trials, n_agents, n_gabors, 2), dtype=pos_dtype) if keep_stims else None,
+        selected=numpy.empty((n_trials, n_agents, 2), dtype=pos_dtype),
+        score=numpy.empty((n_trials, n_agents), dtype=grid.dtype),
+        delta=numpy.empty((n_trials, n_agents), dtype=grid.dtype),
+    )
+
+    agents = numpy.arange(n_agents)
+    for trial in range(n_trials):
+        stims = sample_neighborhoods(grid.shape, pos, n_gabors, offsets, prng)
+        valid = stims[:, :, 0] >= 0
+        scores = numpy.where(valid, grid[stims[:, :, 0], stims[:, :, 1]], 0)
+
+        choice = select(scores, valid, prng, **strategy_kwargs)
+        selected = stims[agents, choice]
+        score = scores[agents, choice]
+
+        trajectories.pos[trial] = pos
+        if keep_stims:
+            trajectories.stims[trial] = stims
+        trajectories.selected[trial] = selected
+        trajectories.score[trial] = score
+        trajectories.delta[trial] = score - grid[pos[:, 0], pos[:, 1]]
+
+        pos = selected
+
+    return trajectories
+
+
+def sample_neighborhoods(dims, positions, n_sampled, offsets, prng, max_redraws=20):
+    """Sample positions from the neighborhood of many positions at once.
+
+    Equivalent to calling Landscape.sample_neighborhood for every row in
+    positions. Offsets are drawn at random and any that fall off the grid or
+    repeat within a row are redrawn, so the cost per agent does not depend
+    on the size of the neighborhood.
+
+    Returns
+    -------
+    (n_positions, n_sampled, 2) int array. Rows whose neighborhood has
+    fewer than n_sampled positions are padded with -1.
+    """
+    positions = numpy.asarray(positions)
+    n_positions = len(positions)
+    n_offsets = len(offsets)
+
+    ix = prng.randint(n_offsets, size=(n_positions, n_sampled))
+    bad_rows = numpy.arange(n_positions)
+    for _ in range(max_redraws + 1):
+        bad = _find_bad_samples(dims, positions[bad_rows], offsets, ix[bad_rows])
+        redraw = bad.any(axis=1)
+        bad_rows, bad = bad_rows[redraw], bad[redraw]
+        if len(bad_rows) == 0:
+            break
+        redrawn = ix[bad_rows]
+        redrawn[bad] = prng.randint(n_offsets, size=bad.sum())
+        ix[bad_rows] = redrawn
+
+    # Rows that are still invalid are near the corner of a small grid.
+    # Fall back on shuffling their whole neighborhood.
+    padded = numpy.ones((len(bad_rows), n_sampled), dtype=bool)
+    if len(bad_rows):
+        neighbors = positions[bad_rows, numpy.newaxis, :] + offsets
+        keys = prng.random_sample((len(bad_rows), n_offsets))
+        keys[~_is_on_grid(dims, neighbors)] = numpy.inf
+        order = numpy.argsort(keys, axis=1)[:, :n_sampled]
+        rows = numpy.arange(len(bad_rows))[:, numpy.newaxis]
+        ix[bad_rows, :order.shape[1]] = order
+        padded[:, :order.shape[1]] = numpy.isinf(keys[rows, order])
+
+    samples = positions[:, numpy.newaxis, :] + offsets[ix]
+    padded_rows, padded_cols = padded.nonzero()
+    samples[bad_rows[padded_rows], padded_cols] = -1
+    return samples
+
+
+def _find_bad_samples(dims, positions, offsets, ix):
+    """Mark sampled offsets that are off the grid or already sampled."""
+    samples = positions[:, numpy.newaxis, :] + offsets[ix]
+    bad = ~_is_on_grid(dims, samples)
+
+    for col in range(1, ix.shape[1]):
+        bad[:, col] |= (ix[:, :col] == ix[:, col:col+1]).any(axis=1)
+    return bad
+
+
+def _is_on_grid(dims, samples):
+    n_rows, n_cols = dims
+    x, y = samples[..., 0], samples[..., 1]
+    return (x >= 0) & (x < n_rows) & (y >= 0) & (y < n_cols)
+
+
+def select_greedy(scores, valid, prng):
+    """Pick the most valuable gem."""
+    return numpy.where(valid, scores, -numpy.inf).argmax(axis=1)
+
+
+def select_softmax(scores, valid, prng, temperature=5.0):
+    """Pick gems with probability proportional to exp(score/temperature)."""
+    gumbel = -numpy.log(-numpy.log(prng.random_sample(scores.shape)))
+    utility = scores/float(temperature) + gumbel
+    return numpy.where(valid, utility, -numpy.inf).argmax(axis=1)
+
+
+def select_noisy(scores, valid, prng, noise=5.0):
+    """Pick the gem that looks most valuable after adding gaussian noise."""
+    utility = scores + noise * prng.standard_normal(scores.shape)
+    return numpy.where(valid, utility, -numpy.inf).argmax(axis=1)
+
+
+STRATEGIES = dict(
+    greedy=select_greedy,
+    softmax=select_softmax,
+    noisy=select_noisy,
+)
+
+
+def summarize(trajectories, landscape):
+    """Summarize simulated trajectories in a single row of statistics."""
+    max_score = landscape.get_score_grid().max()
+    final_score = trajectories.score[-1]
+    reached_max = (trajectories.score == max_score)
+    trials_to_max = numpy.where(reached_max.any(axis=0), reached_max.argmax(axis=0), numpy.nan)
+    return OrderedDict([
+        ('mean_score', trajectories.score.mean()),
+        ('mean_final_score', final_score.mean()),
+        ('sd_final_score', final_score.std()),
+        ('prop_reached_max', reached_max.any(axis=0).mean()),
+        ('mean_trials_to_max', numpy.nanmean(trials_to_max) if reached_max.any() else numpy.nan),
+    ])
+
+
+def create_conditions(landscape_names, sight_radii, n_gabors, n_trials_per_block):
+    """Create all combinations of simulation parameters."""
+    return [
+        OrderedDict(zip(SWEEP_PARAMETERS, values))
+        for values in product(landscape_names, sight_radii, n_gabors, n_trials_per_block)
+    ]
+
+
+def simulate_condition(condition):
+    """Simulate a single condition of a parameter sweep.
+
+    The condition must include the seed to use for its random number
+    generator, so results do not depend on which process runs it.
+    """
+    condition = condition.copy()
+    strategy_kwargs = condition.pop('strategy_kwargs', {})
+    landscape = create_landscape(condition['landscape_name'])
+    trajectories = simulate(landscape,
+                            n_agents=condition['n_agents'],
+                            n_trials=condition['n_trials_per_block'],
+                            sight_radius=condition['sight_radius'],
+                            n_gabors=condition['n_gabors'],
+                            strategy=condition['strategy'],
+                            seed=condition['seed'],
+                            keep_stims=False,
+                            **strategy_kwargs)
+    condition.update(summarize(trajectories, landscape))
+    return condition
+
+
+def run_sweep(conditions, n_agents, strategy='greedy', seed=0, n_workers=None, **strategy_kwargs):
+    """Simulate every condition on a pool of processes.
+
+    Each condition gets its own random number generator, seeded from the
+    sweep seed and the position of the condition in the sweep, so the same
+    sweep gives exactly the same results however it is split across workers.
+
+    Returns
+    -------
+    pandas.DataFrame, with one row of summary statistics per condition.
+    """
+    from pandas import DataFrame
+
+    jobs = []
+    for condition_ix, condition in enumerate(conditions):
+        job = OrderedDict(condition)
+        job['strategy'] = strategy
+        job['n_agents'] = n_agents
+        job['seed'] = [seed, condition_ix]
+        job['strategy_kwargs'] = strategy_kwargs
+        jobs.append(job)
+
+    pool = Pool(n_workers or cpu_count())
+    try:
+        results = pool.map(simulate_condition, jobs, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+    summary = DataFrame.from_records(results, columns=results[0].keys())
+    summary['seed'] = seed
+    for name, value in sorted(strategy_kwargs.items()):
+        summary[name] = value
+    return summary
@@ -0,0 +1,187 @@
+"""Define landscapes in YAML instead of code.
+
+A spec gives the dimensions and feature ranges of a landscape, and a
+score made by adding up components. The score is compiled once into a
+function that evaluates whole arrays of positions, and compiled specs
+are cached by a hash of the spec.
+
+Example spec
+------------
+
+    n_rows: 71
+    n_cols: 71
+    min_ori: 10
+    max_ori: 110
+    min_sf: 0.04
+    max_sf: 0.18
+    score:
+      - hill: {x: 20, y: 50, height: 100, width: 12}
+      - hill: {x: 55, y: 15, height: 70, width: 8}
+      - ridge: {x: 35, y: 35, angle: 45, height: 20, width: 4}
+      - noise: {scale: 5, smoothness: 3, seed: 1}
+    normalize: true  # rescale scores to integers from 0 to 100
+"""
+import json
+import hashlib
+from os import path
+
+import numpy
+
+from .landscape import Landscape
+
+
+SPEC_EXTENSIONS = ('.yml', '.yaml')
+
+# Top-level keys of a spec.
+SPEC_KEYS = ['n_rows', 'n_cols', 'min_ori', 'max_ori', 'min_sf', 'max_sf', 'score', 'normalize']
+
+# Defaults of the parameters of each score component.
+COMPONENTS = dict(
+    hill=dict(x=0.0, y=0.0, height=100.0, width=10.0),
+    ridge=dict(x=0.0, y=0.0, angle=0.0, height=100.0, width=5.0),
+    plane=dict(slope_x=1.0, slope_y=1.0),
+    noise=dict(scale=1.0, smoothness=2.0, seed=0),
+)
+
+_compiled = {}  # spec hash -> score function
+
+
+def is_spec_file(name):
+    return name.endswith(SPEC_EXTENSIONS)
+
+
+def find_spec_file(name, spec_dir):
+    """Find the spec file for a landscape name, or None if there isn't one."""
+    candidates = [name] if is_spec_file(name) else [path.join(spec_dir, name + ext)
+                                                     for ext in SPEC_EXTENSIONS]
+    for spec_file in candidates:
+        if path.exists(spec_file):
+            return spec_file
+
+
+def load_spec(spec_file):
+    """Load a spec from a YAML file, checking its top-level keys."""
+    import yaml
+    with open(spec_file) as f:
+        spec = yaml.safe_load(f)
+    for key in sorted(spec):
+        if key not in SPEC_KEYS:
+            raise ValueError("Unknown key '{}' in spec {}. Keys are: {}".format(
+                key, spec_file, ', '.join(SPEC_KEYS)))
+    return spec
+
+
+def hash_spec(spec):
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def compile_spec(spec):
+    """Compile the score of a spec into a function of position arrays.
+
+    Returns
+    -------
+    function, taking arrays of x and y grid coordinates and returning an
+    array of scores, cached by the hash of the spec.
+    """
+    key = hash_spec(spec)
+    if key not in _compiled:
+        _compiled[key] = _compile(spec)
+    return _compiled[key]
+
+
+def _compile(spec):
+    dims = (spec['n_rows'], spec['n_cols'])
+    terms = []
+    for component in spec['score']:
+        (kind, params), = component.items()
+        if kind not in COMPONENTS:
+            raise ValueError("Unknown score component '{}'. Components are: {}".format(
+                kind, ', '.join(sorted(COMPONENTS))))
+        unknown = set(params or {}) - set(COMPONENTS[kind])
+        if unknown:
+            raise ValueError("Unknown parameters for {}: {}".format(kind, ', '.join(sorted(unknown))))
+        kwargs = dict(COMPONENTS[kind], **(params or {}))
+        terms.append(globals()['_' + kind](dims=dims, **kwargs))
+
+    def evaluate_raw(x, y):
+        x, y = numpy.asarray(x, dtype=float), numpy.asarray(y, dtype=float)
+        return sum(term(x, y) for term in terms)
+
+    if not spec.get('normalize', True):
+        return evaluate_raw
+
+    x, y = numpy.indices(dims)
+    raw = evaluate_raw(x, y)
+    low, span = raw.min(), (raw.max() - raw.min()) or 1.0
+
+    def evaluate(x, y):
+        scores = (evaluate_raw(x, y) - low) / span * 100
+        return scores.clip(0, 100).astype(int)
+    return evaluate
+
+
+def _hill(x, y, height, width, dims):
+    cx, cy = x, y
+
+    def hill(x, y):
+        return height * numpy.exp(-((x - cx)**2 + (y - cy)**2) / (2.0 * width**2))
+    return hill
+
+
+def _ridge(x, y, angle, height, width, dims):
+    cx, cy = x, y
+    sin, cos = numpy.sin(numpy.radians(angle)), numpy.cos(numpy.radians(angle))
+
+    def ridge(x, y):
+        distance = -(x - cx) * sin + (y - cy) * cos
+        return height * numpy.exp(-distance**2 / (2.0 * width**2))
+    return ridge
+
+
+def _plane(slope_x, slope_y, dims):
+    def plane(x, y):
+        return slope_x * x + slope_y * y
+    return plane
+
+
+def _noise(scale, smoothness, seed, dims):
+    from scipy.ndimage import gaussian_filter
+    field = gaussian_filter(numpy.random.RandomState(seed).standard_normal(dims), smoothness)
+    field *= scale / (field.std() or 1.0)
+
+    def noise(x, y):
+        ix = numpy.clip(numpy.round(x).astype(int), 0, dims[0] - 1)
+        iy = numpy.clip(numpy.round(y).astype(int), 0, dims[1] - 1)
+        return field[ix, iy]
+    return noise
+
+
+class SpecLandscape(Landscape):
+    """A landscape defined by a spec, see gems.specs."""
+    def __init__(self, spec, name='', **kwargs):
+        for attr in ['min_ori', 'max_ori', 'min_sf', 'max_sf']:
+            if attr in spec:
+                setattr(self, attr, spec[attr])
+        super(SpecLandscape, self).__init__(n_rows=spec['n_rows'], n_cols=spec['n_cols'], **kwargs)
+        self.spec = spec
+        self.spec_hash = hash_spec(spec)
+        self.name = name
+        self.evaluate = compile_spec(spec)
+
+    @classmethod
+    def from_file(cls, spec_file, **kwargs):
+        name = path.splitext(path.basename(spec_file))[0]
+        return cls(load_spec(spec_file), name=name, **kwargs)
+
+    def get_score(self, grid_pos):
+        if not self.is_position_on_grid(grid_pos):
+            raise IndexError('{} is off the {}x{} grid'.format(grid_pos, *self.dims))
+        x, y = grid_pos
+        return self.get_score_grid()[x, y].item()
+
+    def get_score_grid(self):
+        """Evaluate the scores of all grid positions at once."""
+        def create(landscape):
+            x, y = numpy.indices(landscape.dims)
+            return landscape.evaluate(x, y)
+        return self.get_table('score_grid', create)
@@ -9,7 +9,7 @@ from .config import DATA_DIR
 from .inherited_instructions import load_ancestor_instructions
 
 
-def get_subj_info(gui_yaml, version=None, check_exists=None, verify=None, save_order=False):
+def get_subj_info(gui_yaml, version=None, check_exists=None, verify=None, save_order=False, fixed=None):
     """Create a psychopy.gui from a yaml config file.
 
     The first time the experiment is run, a pickle of that subject's settings
@@ -26,6 +26,7 @@ def get_subj_info(gui_yaml, version=None, check_exists=None, verify=None, save_o
         verify, an error is displayed.
     save_order: bool, Should the key order be saved in "_order"? Defaults to
         True.
+    fixed: dict, Values that are shown in the gui but can't be edited.
 
 
     Expected YAML data
@@ -86,6 +87,11 @@ def get_subj_info(gui_yaml, version=None, check_exists=None, verify=None, save_o
         gui_data['version'] = version
         fixed_fields.append('version')
 
+    for name, value in (fixed or {}).items():
+        gui_data[name] = value
+        if name not in fixed_fields:
+            fixed_fields.append(name)
+
     while True:
         # Bring up the dialogue
         dlg = gui.DlgFromDict(gui_data, order=ordered_names,
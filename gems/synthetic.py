@@ -0,0 +1,179 @@
+"""Generate synthetic datasets for testing analyses at scale.
+
+Sessions are simulated with softmax explorers that become less noisy in
+each generation, and are written as session files in the format of
+config.data_columns, with an instructions file for every subject and
+inherit_from links that form valid chains. All the subjects in one
+generation are simulated and written together, so datasets with millions
+of trials can be generated without holding them in memory.
+
+Examples:
+
+    >>> from gems.synthetic import generate
+    >>> generate('synthetic-data', n_chains=625, n_generations=10, seed=0)
+"""
+import os
+from datetime import datetime, timedelta
+from os import path
+
+import numpy
+
+from .config import data_columns
+from .landscape import create_landscape
+from .simulation import simulate
+from .util import format_pos_column, format_pos_list_column
+
+
+COMPUTERS = ['Kramer', 'Elaine', 'George', 'Jerry']
+EXPERIMENTERS = ['SF', 'VC', 'PL']
+FEATURES = ['thin stripes', 'thick stripes', 'stripes tilted to the left',
+            'stripes tilted to the right', 'vertical stripes', 'horizontal stripes']
+PHRASES = ['Start by picking the gems with {}.',
+           'The most valuable gems have {}.',
+           'Avoid gems with {}, they are worth less.',
+           'Once the scores stop going up, look for {}.',
+           'If a gem with {} was good, pick one like it again.']
+
+
+def generate(output_dir, n_chains, n_generations, seed=0, landscapes=None,
+             starting_pos=(0, 0), sight_radius=10, n_gabors=6, n_trials_per_block=40,
+             temperature=40.0, learning_rate=0.8, first_subj_number=1):
+    """Generate the session files and instructions of a synthetic dataset.
+
+    Parameters
+    ----------
+    output_dir: str, Directory for session files. Instructions are written
+        to an "instructions" directory inside it.
+    n_chains: int, Number of chains.
+    n_generations: int, Number of generations in every chain.
+    seed: int, Seed for the random number generators.
+    landscapes: list of str, The landscape of each block.
+    temperature: float, Softmax temperature of the first generation.
+    learning_rate: float, Each generation's temperature is this fraction of
+        the previous generation's.
+    first_subj_number: int, Number of the first subj_id.
+
+    Returns
+    -------
+    int, the number of trials written.
+    """
+    landscapes = landscapes or ['SimpleHill'] * 4
+    instructions_dir = path.join(output_dir, 'instructions')
+    for expected_dir in [output_dir, instructions_dir]:
+        if not path.isdir(expected_dir):
+            os.makedirs(expected_dir)
+
+    n_subjs = n_chains * n_generations
+    width = len(str(first_subj_number + n_subjs - 1))
+    subj_ids = numpy.array(['GEMS{:0{}d}'.format(first_subj_number + i, width)
+                            for i in range(n_subjs)]).reshape(n_generations, n_chains)
+
+    n_trials = 0
+    for generation in range(1, n_generations + 1):
+        prng = numpy.random.RandomState([seed, generation])
+        gen_subj_ids = subj_ids[generation-1]
+        inherit_from = subj_ids[generation-2] if generation > 1 else numpy.full(n_chains, '', dtype=object)
+        gen_temperature = temperature * learning_rate ** (generation - 1)
+
+        blocks = []
+        for block_ix, name in enumerate(landscapes):
+            landscape = create_landscape(name)
+            trajectories = simulate(landscape, n_chains, n_trials_per_block, sight_radius, n_gabors,
+                                    strategy='softmax', starting_pos=starting_pos,
+                                    seed=[seed, generation, block_ix], temperature=gen_temperature)
+            blocks.append((name, landscape, trajectories))
+
+        sessions = create_sessions(blocks, gen_subj_ids, inherit_from, generation, prng,
+                                   sight_radius=sight_radius, n_gabors=n_gabors,
+                                   starting_pos=starting_pos)
+        n_rows = len(landscapes) * n_trials_per_block
+        lines = sessions.to_csv(index=False, header=False).splitlines(True)
+        header = ','.join(data_columns) + '\n'
+        for i, subj_id in enumerate(gen_subj_ids):
+            with open(path.join(output_dir, '{}.csv'.format(subj_id)), 'w') as f:
+                f.write(header)
+                f.writelines(lines[i*n_rows:(i+1)*n_rows])
+            with open(path.join(instructions_dir, '{}.txt'.format(subj_id)), 'w') as f:
+                f.write(create_instructions(prng))
+        n_trials += len(sessions)
+
+    return n_trials
+
+
+def create_sessions(blocks, subj_ids, inherit_from, generation, prng,
+                    sight_radius, n_gabors, starting_pos):
+    """Arrange simulated blocks as trials sorted by subject, block and trial.
+
+    Parameters
+    ----------
+    blocks: list of (landscape_name, landscape, Trajectories), one per
+        block, each simulating one agent per subject.
+
+    Returns
+    -------
+    pandas.DataFrame, with the columns in config.data_columns.
+    """
+    from pandas import DataFrame
+
+    n_trials, n_subjs = blocks[0][2].score.shape
+    n_blocks = len(blocks)
+    n_rows = n_subjs * n_blocks * n_trials
+
+    def by_subj(values):
+        """Reorder (n_blocks, n_trials, n_subjs, ...) arrays by subject first."""
+        values = numpy.asarray(values)
+        values = numpy.moveaxis(values, 2, 0)
+        return values.reshape((n_rows,) + values.shape[3:])
+
+    dims = blocks[0][1].dims
+    pos = by_subj([t.pos for _, _, t in blocks])
+    stims = by_subj([t.stims for _, _, t in blocks])
+    selected = by_subj([t.selected for _, _, t in blocks])
+
+    landscape_names = numpy.array([name for name, _, _ in blocks], dtype=object)
+    starting_scores = numpy.array([landscape.score(starting_pos) for _, landscape, _ in blocks])
+
+    # Time per trial: a log-normal rt, plus the fixation, feedback and ITI
+    rt = prng.lognormal(mean=0.9, sigma=0.5, size=(n_subjs, n_blocks * n_trials)).round(2)
+    exp_time = 150 + numpy.cumsum(rt + 4.0, axis=1)
+
+    start = datetime(2018, 9, 24, 9, 0)
+    dates = numpy.array([(start + timedelta(hours=int(h))).strftime('%Y_%b_%d_%H%M')
+                         for h in prng.randint(0, 24*90, size=n_subjs)])
+
+    subj_ix = numpy.repeat(numpy.arange(n_subjs), n_blocks * n_trials)
+    block_ix = numpy.tile(numpy.repeat(numpy.arange(n_blocks), n_trials), n_subjs)
+    columns = dict(
+        subj_id=numpy.asarray(subj_ids)[subj_ix],
+        date=dates[subj_ix],
+        computer=numpy.array(COMPUTERS)[prng.randint(len(COMPUTERS), size=n_subjs)][subj_ix],
+        experimenter=numpy.array(EXPERIMENTERS)[prng.randint(len(EXPERIMENTERS), size=n_subjs)][subj_ix],
+        version='1.2',
+        generation=generation,
+        inherit_from=numpy.asarray(inherit_from, dtype=object)[subj_ix],
+        sight_radius=sight_radius,
+        n_gabors=n_gabors,
+        sampling='uniform',
+        block_ix=block_ix + 1,
+        landscape_name=landscape_names[block_ix],
+        starting_pos='{}-{}'.format(*starting_pos),
+        starting_score=starting_scores[block_ix],
+        trial=numpy.tile(numpy.arange(n_trials), n_subjs * n_blocks),
+        pos=format_pos_column(pos, dims),
+        stims=format_pos_list_column(stims, dims),
+        selected=format_pos_column(selected, dims),
+        rt=rt.ravel(),
+        score=by_subj([t.score for _, _, t in blocks]),
+        delta=by_subj([t.delta for _, _, t in blocks]),
+        exp_time=exp_time.ravel(),
+    )
+    return DataFrame(columns, columns=data_columns)
+
+
+def create_instructions(prng, min_length=100):
+    """Write instructions from phrases about the features of the gems."""
+    sentences = []
+    while sum(len(s) + 1 for s in sentences) < min_length:
+        phrase = PHRASES[prng.randint(len(PHRASES))]
+        sentences.append(phrase.format(FEATURES[prng.randint(len(FEATURES))]))
+    return ' '.join(sentences)
@@ -0,0 +1,138 @@
+"""Time the phases of each trial in an experiment session.
+
+Timing is opt-in. When a PhaseTimer is disabled, timing a phase costs a
+single method call, so the hooks can be left in the trial loop.
+"""
+import cProfile
+from os import path
+from timeit import default_timer
+
+import numpy
+
+
+class PhaseTimer(object):
+    """Record how long each phase of each trial takes.
+
+    Examples:
+
+        >>> timer = PhaseTimer(enabled=True)
+        >>> timer.trial = 0
+        >>> with timer.phase('flip'):
+        ...     win.flip()
+        >>> timer.summarize()
+    """
+    columns = ['block_ix', 'trial', 'phase', 'seconds']
+    percentiles = [50, 90, 99]
+
+    def __init__(self, enabled=False, profile_blocks=False):
+        self.enabled = enabled
+        self.profile_blocks = profile_blocks
+        self.block_ix = ''
+        self.trial = ''
+        self.records = []
+        self.profiles = {}
+
+    def phase(self, name):
+        """Time a phase of the current trial in a with statement."""
+        if not self.enabled:
+            return _null_phase
+        return _Phase(self, name)
+
+    def record(self, name, seconds):
+        self.records.append((self.block_ix, self.trial, name, seconds))
+
+    def profile(self, name):
+        """Run cProfile in a with statement, if profiling blocks."""
+        if not self.profile_blocks:
+            return _null_phase
+        profiler = cProfile.Profile()
+        self.profiles[name] = profiler
+        return _Profile(profiler)
+
+    def summarize(self):
+        """Summarize the time spent per trial in each phase.
+
+        Phases that occur more than once in a trial are added together.
+
+        Returns
+        -------
+        list of (phase, n_trials, percentiles, max) tuples.
+        """
+        per_trial = {}
+        for block_ix, trial, name, seconds in self.records:
+            key = (name, block_ix, trial)
+            per_trial[key] = per_trial.get(key, 0) + seconds
+
+        phases = {}
+        for (name, _, _), seconds in per_trial.items():
+            phases.setdefault(name, []).append(seconds)
+
+        summary = []
+        for name in self.phase_order(phases):
+            times = numpy.array(phases[name])
+            summary.append((name, len(times), numpy.percentile(times, self.percentiles), times.max()))
+        return summary
+
+    def phase_order(self, phases):
+        """Order phases by when they first occurred."""
+        first = {}
+        for i, (_, _, name, _) in enumerate(self.records):
+            first.setdefault(name, i)
+        return sorted(phases, key=first.get)
+
+    def format_summary(self):
+        header = '{:<20} {:>8}'.format('phase', 'n') + \
+            ''.join(' {:>9}'.format('p{}'.format(p)) for p in self.percentiles) + \
+            ' {:>9}'.format('max')
+        lines = ['Trial phase durations (ms)', header]
+        for name, n, percentiles, longest in self.summarize():
+            line = '{:<20} {:>8}'.format(name, n)
+            line += ''.join(' {:>9.1f}'.format(p*1000) for p in percentiles)
+            line += ' {:>9.1f}'.format(longest*1000)
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def write(self, filename):
+        """Write the timing log, and the profile of each block alongside it."""
+        with open(filename, 'w') as f:
+            f.write(','.join(self.columns) + '\n')
+            for record in self.records:
+                f.write('{},{},{},{:.6f}\n'.format(*record))
+
+        stem = path.splitext(filename)[0]
+        for name, profiler in self.profiles.items():
+            profiler.dump_stats('{}-{}.prof'.format(stem, name))
+
+
+class _Phase(object):
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = default_timer()
+
+    def __exit__(self, *exc_info):
+        self.timer.record(self.name, default_timer() - self.start)
+
+
+class _Profile(object):
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def __enter__(self):
+        self.profiler.enable()
+
+    def __exit__(self, *exc_info):
+        self.profiler.disable()
+
+
+class _NullPhase(object):
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_null_phase = _NullPhase()
@@ -0,0 +1,191 @@
+"""Characterize the shape of a landscape.
+
+All analyses operate on the score grid of a landscape with array
+operations, and their results are cached on the landscape so that
+repeated analyses and comparisons between landscapes are instant.
+"""
+from collections import OrderedDict
+
+import numpy
+
+from .oracle import get_radius_max_grid
+from .util import create_neighborhood_offsets
+
+
+def label_plateaus(landscape, radius=1):
+    """Label the plateaus of a landscape.
+
+    A plateau is a connected region of positions with the same score,
+    where positions are connected if they are within radius of each
+    other. Every position is on a plateau, which may be a single position.
+
+    Returns
+    -------
+    labels: (n_rows, n_cols) int array, the plateau of each grid position.
+    first: (n_plateaus, ) int array, the flat index of the first position
+        of each plateau in the score grid.
+    """
+    def create(landscape):
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        grid = landscape.get_score_grid()
+        n_rows, n_cols = grid.shape
+        x, y = numpy.indices(grid.shape)
+        sources, targets = [], []
+        for dx, dy in create_neighborhood_offsets(radius):
+            nx, ny = x + dx, y + dy
+            on_grid = (nx >= 0) & (nx < n_rows) & (ny >= 0) & (ny < n_cols)
+            same = numpy.zeros(grid.shape, dtype=bool)
+            same[on_grid] = grid[nx[on_grid], ny[on_grid]] == grid[on_grid]
+            sources.append((x * n_cols + y)[same])
+            targets.append((nx * n_cols + ny)[same])
+        sources, targets = numpy.concatenate(sources), numpy.concatenate(targets)
+        edges = coo_matrix((numpy.ones(len(sources)), (sources, targets)), shape=(grid.size, grid.size))
+        _, labels = connected_components(edges, directed=False)
+        _, first = numpy.unique(labels, return_index=True)
+        return labels.reshape(grid.shape), first
+    return landscape.get_table(('plateaus', radius), create)
+
+
+def find_local_maxima(landscape, radius=1):
+    """Find the plateaus that are the best within radius.
+
+    A plateau is a local maximum if no position on it has a more valuable
+    position within radius, so a terrace of equal scores on the side of a
+    hill is not a local maximum. Each local maximum is given by the first
+    position of its plateau.
+
+    Returns
+    -------
+    (n_maxima, 2) int array of grid positions.
+    """
+    def create(landscape):
+        _, first = label_plateaus(landscape, radius)
+        is_max = _is_max_plateau(landscape, radius)
+        n_cols = landscape.get_score_grid().shape[1]
+        return numpy.column_stack(numpy.divmod(first[is_max], n_cols))
+    return landscape.get_table(('local_maxima', radius), create)
+
+
+def _is_max_plateau(landscape, radius):
+    """Check if no position on each plateau has a more valuable position within radius."""
+    labels, first = label_plateaus(landscape, radius)
+    is_top = landscape.get_score_grid() == get_radius_max_grid(landscape, radius)
+    n_below = numpy.bincount(labels.ravel(), weights=~is_top.ravel(), minlength=len(first))
+    return n_below == 0
+
+
+def get_ascent_grid(landscape, radius=1):
+    """Get the position a greedy climber moves to from every position.
+
+    A greedy climber moves to the most valuable position within radius
+    that is more valuable than its own. Climbers on a plateau where there
+    is no such position cross the plateau to the most valuable position
+    next to any of its positions, or, if the plateau is a local maximum,
+    move to its first position and stay there.
+
+    Returns
+    -------
+    (n_rows, n_cols) int array of flat indices into the score grid.
+    """
+    def create(landscape):
+        grid = landscape.get_score_grid()
+        n_rows, n_cols = grid.shape
+        x, y = numpy.indices(grid.shape)
+
+        best_score = grid.astype(float)
+        best_x, best_y = x.copy(), y.copy()
+        for dx, dy in create_neighborhood_offsets(radius):
+            nx, ny = x + dx, y + dy
+            on_grid = (nx >= 0) & (nx < n_rows) & (ny >= 0) & (ny < n_cols)
+            score = numpy.full(grid.shape, -numpy.inf)
+            score[on_grid] = grid[nx[on_grid], ny[on_grid]]
+            better = score > best_score
+            best_score[better] = score[better]
+            best_x[better], best_y[better] = nx[better], ny[better]
+        best_ix = (best_x * n_cols + best_y).ravel()
+        best_score = best_score.ravel()
+
+        # The best exit from each plateau, or its first position if there is none
+        labels, first = label_plateaus(landscape, radius)
+        labels = labels.ravel()
+        has_exit = best_score > grid.ravel()
+        exits = numpy.flatnonzero(has_exit)
+        exits = exits[numpy.lexsort((best_score[exits], labels[exits]))]
+        is_best_exit = numpy.append(labels[exits][1:] != labels[exits][:-1], True)
+        plateau_target = first.copy()
+        plateau_target[labels[exits[is_best_exit]]] = best_ix[exits[is_best_exit]]
+
+        ascent = numpy.where(has_exit, best_ix, plateau_target[labels])
+        return ascent.reshape(grid.shape)
+    return landscape.get_table(('ascent', radius), create)
+
+
+def label_basins(landscape, radius=1):
+    """Label every position by the peak that greedy ascent leads to.
+
+    Returns
+    -------
+    labels: (n_rows, n_cols) int array, the basin of each grid position.
+    peaks: (n_basins, 2) int array, the grid position at the top of each
+        basin, such that peaks[labels[x, y]] is where (x, y) leads.
+    """
+    def create(landscape):
+        ascent = get_ascent_grid(landscape, radius).ravel()
+        # Follow pointers to their roots, doubling the path length each step
+        roots = ascent.copy()
+        while True:
+            next_roots = roots[roots]
+            if (next_roots == roots).all():
+                break
+            roots = next_roots
+        peak_ix, labels = numpy.unique(roots, return_inverse=True)
+        n_cols = landscape.get_score_grid().shape[1]
+        peaks = numpy.column_stack(numpy.divmod(peak_ix, n_cols))
+        return labels.reshape(ascent.size // n_cols, n_cols), peaks
+    return landscape.get_table(('basins', radius), create)
+
+
+def get_gradient_magnitude(landscape):
+    """Get the magnitude of the score gradient at every grid position."""
+    def create(landscape):
+        dx, dy = numpy.gradient(landscape.get_score_grid().astype(float))
+        return numpy.hypot(dx, dy)
+    return landscape.get_table('gradient_magnitude', create)
+
+
+def describe(landscape, radius=1):
+    """Summarize the topology of a landscape.
+
+    Returns
+    -------
+    OrderedDict, with:
+        n_local_maxima: number of plateaus that are the best within radius
+        n_basins: number of basins of attraction under greedy ascent
+        largest_basin: proportion of the grid in the largest basin
+        mean_gradient, max_gradient: magnitude of the score gradient
+        neighbor_correlation: correlation between the scores of adjacent
+            positions; values near 1 are smooth, near 0 are rugged
+        mean_neighbor_diff: mean absolute difference in score between
+            adjacent positions
+    """
+    def create(landscape):
+        grid = landscape.get_score_grid().astype(float)
+        labels, peaks = label_basins(landscape, radius)
+        gradient = get_gradient_magnitude(landscape)
+
+        pairs = [(grid[1:, :], grid[:-1, :]), (grid[:, 1:], grid[:, :-1])]
+        first = numpy.concatenate([a.ravel() for a, _ in pairs])
+        second = numpy.concatenate([b.ravel() for _, b in pairs])
+
+        return OrderedDict([
+            ('n_local_maxima', len(find_local_maxima(landscape, radius))),
+            ('n_basins', len(peaks)),
+            ('largest_basin', numpy.bincount(labels.ravel()).max() / float(labels.size)),
+            ('mean_gradient', gradient.mean()),
+            ('max_gradient', gradient.max()),
+            ('neighbor_correlation', numpy.corrcoef(first, second)[0, 1]),
+            ('mean_neighbor_diff', numpy.abs(first - second).mean()),
+        ])
+    return landscape.get_table(('describe', radius), create)
@@ -1,19 +1,160 @@
+import string
 from itertools import product
 
+import numpy
+
+from .config import data_columns
+
+
+_pos_str_tables = {}  # dims -> strings of every grid position, by code
+
+# Maps every separator in a position list to a space, for numpy to parse.
+_separators_to_spaces = string.maketrans('-;\n', '   ')
+
 
 def pos_to_str(pos):
     x, y = pos
     return '{x}-{y}'.format(x=x, y=y)
 
+def format_trial_row(trial_data):
+    """Format the values of a trial in the order of data_columns, for a CSV row."""
+    return [str(trial_data.get(col_name, '')) for col_name in data_columns]
+
 def pos_list_to_str(pos_list):
     return ';'.join([pos_to_str(pos) for pos in pos_list])
 
 def parse_pos(str_pos):
-    return tuple(map(int, str_pos.split('-')))
+    return tuple(map(parse_coord, str_pos.split('-')))
+
+def parse_coord(str_coord):
+    """Parse a grid coordinate, or a continuous coordinate in feature space."""
+    try:
+        return int(str_coord)
+    except ValueError:
+        return float(str_coord)
 
 def parse_pos_list(str_pos_list):
     return [parse_pos(str_pos) for str_pos in str_pos_list.split(';')]
 
+def parse_pos_column(str_positions):
+    """Parse a column of positions into an (n_positions, 2) array.
+
+    Missing positions are parsed as (-1, -1). See parse_pos_list_column.
+    """
+    positions = parse_pos_list_column(str_positions)
+    if positions.shape[1] == 0:
+        return numpy.full((len(str_positions), 2), -1, dtype=int)
+    return positions[:, 0]
+
+def parse_pos_list_column(str_pos_lists):
+    """Parse a column of position lists into an (n_lists, n_positions, 2) array.
+
+    Lists shorter than the longest list are padded with (-1, -1). The
+    array is int if every coordinate is a grid coordinate, and float if
+    any are continuous coordinates in feature space. The whole column is
+    joined into a single string and parsed by numpy, so no strings are
+    split in Python, but every row is checked to have two coordinates per
+    position, so a malformed row raises a ValueError instead of shifting
+    the rows after it.
+    """
+    str_pos_lists = numpy.asarray(str_pos_lists, dtype=object)
+    missing = numpy.array([not isinstance(s, basestring) or s == '' for s in str_pos_lists],
+                          dtype=bool)
+    str_pos_lists = numpy.where(missing, '0-0', str_pos_lists)
+
+    joined = str('\n'.join(str_pos_lists))  # positions are ascii, parsed as bytes
+    chars = numpy.frombuffer(joined, dtype=numpy.uint8)
+    is_newline = chars == ord('\n')
+    row_of_char = numpy.cumsum(is_newline)
+    n_rows = len(str_pos_lists)
+    lengths = numpy.bincount(row_of_char[chars == ord(';')], minlength=n_rows) + 1
+    n_dashes = numpy.bincount(row_of_char[chars == ord('-')], minlength=n_rows)
+
+    spaced = joined.translate(_separators_to_spaces)
+    is_space = numpy.frombuffer(spaced, dtype=numpy.uint8) == ord(' ')
+    is_start = ~is_space & numpy.concatenate([[True], is_space[:-1]])
+    n_coords = numpy.bincount(row_of_char[is_start & ~is_newline], minlength=n_rows)
+
+    malformed = numpy.flatnonzero((n_dashes != lengths) | (n_coords != 2 * lengths))
+    if len(malformed):
+        row = malformed[0]
+        raise ValueError("Malformed positions in row {}: '{}'".format(row, str_pos_lists[row]))
+
+    coords = numpy.fromstring(spaced, dtype=float, sep=' ')
+    if len(coords) != 2 * lengths.sum():
+        raise ValueError('Malformed positions: expected {} coordinates, parsed {}'.format(
+            2 * lengths.sum(), len(coords)))
+    if (coords == coords.round()).all():
+        coords = coords.astype(int)
+    coords = coords.reshape(-1, 2)
+    lengths[missing] = 0
+    keep = numpy.repeat(~missing, numpy.where(missing, 1, lengths))
+    coords = coords[keep]
+
+    n_positions = lengths.max() if len(lengths) else 0
+    positions = numpy.full((n_rows, n_positions, 2), -1, dtype=coords.dtype)
+    rows = numpy.repeat(numpy.arange(n_rows), lengths)
+    cols = numpy.arange(len(rows)) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+    positions[rows, cols] = coords
+    return positions
+
+def pos_to_code(positions, dims):
+    """Pack grid positions into flat indices, x*n_cols + y.
+
+    Parameters
+    ----------
+    positions: (..., 2) int array of grid positions.
+    dims: (n_rows, n_cols) of the grid.
+
+    Returns
+    -------
+    (...) int array of codes, with -1 for positions off the grid.
+    """
+    n_rows, n_cols = dims
+    positions = numpy.asarray(positions, dtype=numpy.intp)
+    x, y = positions[..., 0], positions[..., 1]
+    on_grid = (x >= 0) & (x < n_rows) & (y >= 0) & (y < n_cols)
+    return numpy.where(on_grid, x * n_cols + y, -1)
+
+def code_to_pos(codes, dims):
+    """Unpack flat indices into grid positions, with (-1, -1) for -1."""
+    codes = numpy.asarray(codes)
+    positions = numpy.stack(numpy.divmod(codes, dims[1]), axis=-1)
+    positions[codes < 0] = -1
+    return positions
+
+def _get_pos_str_table(dims):
+    """Get the string of every grid position, indexed by code.
+
+    Tables are cached by dims.
+    """
+    dims = tuple(dims)
+    if dims not in _pos_str_tables:
+        _pos_str_tables[dims] = numpy.array([pos_to_str(pos) for pos in create_grid(*dims)],
+                                            dtype=object)
+    return _pos_str_tables[dims]
+
+def format_pos_column(positions, dims):
+    """Format an (n_positions, 2) int array as a column of strings.
+
+    Positions off the grid are formatted as empty strings.
+    """
+    return format_pos_list_column(positions[:, numpy.newaxis, :], dims)
+
+def format_pos_list_column(positions, dims):
+    """Format an (n_lists, n_positions, 2) int array as a column of strings.
+
+    Padding, i.e. positions off the grid, is left out of each list.
+    """
+    table = numpy.append(_get_pos_str_table(dims), '')  # code -1 is ''
+    strs = table[pos_to_code(positions, dims)]
+    if strs.shape[1] == 0:
+        return numpy.full(len(strs), '', dtype=object)
+    formatted = strs[:, 0]
+    for column in strs[:, 1:].T:
+        formatted = numpy.where(column == '', formatted, formatted + ';' + column)
+    return formatted
+
 def get_pos_list_from_ix(pos_list_ix):
     pos_lists = [pos_list_str.strip() for pos_list_str in open('pos-lists.txt')]
     assert pos_list_ix < len(pos_lists), "pos_list_ix is too big! Max is %s" % (len(pos_lists)-1)
@@ -29,3 +170,14 @@ def create_grid(n_rows, n_cols):
     Grid positions are [(0, 0), (0, 1), ..., (n_rows-1, n_cols-1)]
     """
     return product(range(n_rows), range(n_cols))
+
+def create_neighborhood_offsets(radius):
+    """Create the (dx, dy) offsets of all grid positions within radius.
+
+    Offsets are returned as an (n_offsets, 2) array in the same order
+    that Landscape.get_neighborhood visits positions.
+    """
+    steps = numpy.arange(-radius, radius+1)
+    dx, dy = numpy.meshgrid(steps, steps, indexing='ij')
+    within = (dx**2 + dy**2) <= radius**2
+    return numpy.column_stack([dx[within], dy[within]])
@@ -1,14 +1,31 @@
 #!/usr/bin/env python
 import argparse
-import gems
+from gems.experiment import Experiment
+from gems.sampling import SAMPLING_MODES
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--test', '-t', action='store_true')
+    parser.add_argument('--chains', metavar='STORE',
+                        help='Lease generations from a chain store on the shared drive')
+    parser.add_argument('--time-phases', action='store_true',
+                        help='Log the duration of each phase of every trial')
+    parser.add_argument('--profile', action='store_true',
+                        help='Run cProfile over each block of trials')
+    parser.add_argument('--track-memory', action='store_true',
+                        help='Report memory growth between blocks')
+    parser.add_argument('--sampling', choices=SAMPLING_MODES, default='uniform',
+                        help='How gems are sampled from the neighborhood on each trial')
     args = parser.parse_args()
 
     if args.test:
-        gems.Experiment.win_size = (600 * 2.5, 400 * 2.5)
+        Experiment.win_size = (600 * 2.5, 400 * 2.5)
 
-    experiment = gems.Experiment.from_gui('gui.yml')
+    Experiment.coordinator = args.chains
+    Experiment.time_phases = args.time_phases
+    Experiment.profile_blocks = args.profile
+    Experiment.track_memory = args.track_memory
+    Experiment.sampling = args.sampling
+
+    experiment = Experiment.from_gui('gui.yml')
     experiment.run()
@@ -1,9 +1,13 @@
 from invoke import Collection
 
-from . import landscape, experiment, subjects, figures
+from . import landscape, experiment, subjects, figures, simulate, data, benchmark, chains
 
 ns = Collection()
 ns.add_collection(experiment, 'exp')
 ns.add_collection(landscape, 'landscape')
 ns.add_collection(subjects, 'subjs')
 ns.add_collection(figures, 'fig')
+ns.add_collection(simulate, 'sim')
+ns.add_collection(data, 'data')
+ns.add_collection(benchmark, 'bench')
+ns.add_collection(chains, 'chains')
@@ -0,0 +1,116 @@
+"""Skip rebuilding derived landscape files that are already up to date.
+
+Every artifact is keyed by a hash of the source of the landscape class,
+the source of the function that builds the artifact, the parameters of
+the landscape, and the settings used to render it. The
+key of each artifact is recorded in a manifest next to it, and artifacts
+are only rebuilt when their key changes or the file is missing.
+"""
+import json
+import hashlib
+import inspect
+from os import path
+from multiprocessing import Pool, cpu_count
+
+import numpy
+
+from gems import score_funcs, specs
+from gems.landscape import Landscape
+
+MANIFEST = '.artifacts.json'
+
+
+def landscape_key(landscape, func, settings=None):
+    """Hash everything that determines an artifact derived from a landscape.
+
+    Parameters
+    ----------
+    landscape: gems.Landscape, The landscape the artifact is derived from.
+    func: function, The function that builds the artifact.
+    settings: dict, The settings passed to func.
+    """
+    sha = hashlib.sha1()
+    for cls in type(landscape).__mro__:
+        if issubclass(cls, Landscape):
+            sha.update(inspect.getsource(cls).encode('utf-8'))
+    sha.update(inspect.getsource(score_funcs).encode('utf-8'))
+    if isinstance(landscape, specs.SpecLandscape):
+        # Spec scores are compiled by the components of the module
+        sha.update(inspect.getsource(specs).encode('utf-8'))
+    sha.update(inspect.getsource(func).encode('utf-8'))
+
+    params = {}
+    for name in ['min_ori', 'max_ori', 'min_sf', 'max_sf']:
+        params[name] = getattr(landscape, name)
+    for name, value in sorted(vars(landscape).items()):
+        if isinstance(value, numpy.ndarray):
+            sha.update(value.tobytes())
+        elif isinstance(value, (bool, int, float, str, tuple, type(None))):
+            params[name] = value
+
+    sha.update(json.dumps([func.__name__, params, settings or {}], sort_keys=True).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def read_manifest(output_dir):
+    manifest = path.join(output_dir, MANIFEST)
+    if not path.exists(manifest):
+        return {}
+    with open(manifest) as f:
+        return json.load(f)
+
+
+def write_manifest(output_dir, keys):
+    with open(path.join(output_dir, MANIFEST), 'w') as f:
+        json.dump(keys, f, indent=2, sort_keys=True)
+
+
+def build(jobs, force=False, n_workers=None):
+    """Build the artifacts that are missing or out of date.
+
+    Parameters
+    ----------
+    jobs: list of (func, landscape_name, output, settings, key) tuples.
+        Artifacts are built by calling func(landscape_name, output, settings).
+    force: bool, Rebuild artifacts even if they are up to date.
+    n_workers: int, Number of processes. Defaults to the number of cores.
+
+    Returns
+    -------
+    list of the outputs that were built.
+    """
+    manifests = {}
+    stale = []
+    for job in jobs:
+        func, name, output, settings, key = job
+        output_dir = path.dirname(path.abspath(output))
+        manifest = manifests.setdefault(output_dir, read_manifest(output_dir))
+        if force or not path.exists(output) or manifest.get(path.basename(output)) != key:
+            stale.append(job)
+        else:
+            print('{} is up to date'.format(output))
+
+    if len(stale) > 1 and n_workers != 1:
+        pool = Pool(min(n_workers or cpu_count(), len(stale)))
+        try:
+            pool.map(_build_job, stale, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for job in stale:
+            _build_job(job)
+
+    for func, name, output, settings, key in stale:
+        output_dir = path.dirname(path.abspath(output))
+        manifests[output_dir][path.basename(output)] = key
+        print('Built {}'.format(output))
+    for output_dir in set(path.dirname(path.abspath(job[2])) for job in stale):
+        write_manifest(output_dir, manifests[output_dir])
+
+    return [job[2] for job in stale]
+
+
+def _build_job(job):
+    func, name, output, settings, _ = job
+    func(name, output, settings)
@@ -0,0 +1,87 @@
+import sys
+import json
+import timeit
+from os import path
+
+import numpy
+
+from invoke import task
+
+BASELINE = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'benchmarks', 'baseline.json')
+
+
+@task
+def run(ctx, pattern=None, save=False, threshold=0.25, baseline=BASELINE, repeat=7):
+    """Time the hot paths and compare them to a baseline saved on this machine.
+
+    Each benchmark is timed in repeat batches, and compared by the median
+    time per call. A benchmark regresses if it is slower than the baseline
+    by more than threshold, e.g. 0.25 for 25%, plus three times the spread
+    of the batches in either run, so noisy benchmarks need a larger
+    slowdown to fail. Baselines depend on the machine, so they are not
+    committed. The first run saves a baseline if there is none.
+
+    Examples:
+
+        $ inv bench.run                 # save a baseline, then compare to it
+        $ inv bench.run --save          # replace the baseline
+        $ inv bench.run -p neighborhood
+
+    """
+    from benchmarks.suite import iter_cases
+
+    results = {}
+    for name, func in iter_cases(pattern):
+        results[name] = time_per_call(func, repeat=int(repeat))
+
+    previous = {}
+    if path.exists(baseline):
+        with open(baseline) as f:
+            previous = json.load(f)
+    else:
+        save = True
+
+    regressions = []
+    row = '{:<60} {:>12} {:>12} {:>8} {:>8}'
+    print(row.format('benchmark', 'seconds', 'baseline', 'ratio', 'limit'))
+    for name in sorted(results):
+        seconds, spread = results[name]
+        if name in previous:
+            base_seconds, base_spread = previous[name]
+            ratio = seconds / base_seconds
+            limit = 1 + float(threshold) + 3 * max(spread, base_spread)
+            print(row.format(name, '%.3g' % seconds, '%.3g' % base_seconds,
+                             '%.2f' % ratio, '%.2f' % limit))
+            if ratio > limit:
+                regressions.append(name)
+        else:
+            print(row.format(name, '%.3g' % seconds, '-', '-', '-'))
+
+    if save:
+        previous.update(results)
+        with open(baseline, 'w') as f:
+            json.dump(previous, f, indent=2, sort_keys=True)
+        print('Saved baseline to {}'.format(baseline))
+    elif regressions:
+        print('{} benchmarks regressed beyond their limit:'.format(len(regressions)))
+        for name in regressions:
+            print('  ' + name)
+        sys.exit(1)
+
+
+def time_per_call(func, repeat=7, min_batch_time=0.05):
+    """Time func in batches of at least min_batch_time.
+
+    Returns
+    -------
+    (seconds, spread), the median time per call and the median absolute
+    deviation of the batches relative to the median.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_batch_time:
+        number *= 2
+    times = numpy.array(timer.repeat(repeat=repeat, number=number)) / number
+    seconds = numpy.median(times)
+    spread = numpy.median(abs(times - seconds)) / seconds
+    return float(seconds), float(spread)
@@ -0,0 +1,41 @@
+from invoke import task
+
+from gems.coordinator import ChainCoordinator
+
+
+@task
+def create(ctx, store, n_chains=4, continue_from=None):
+    """Create chains in a chain store on the shared drive.
+
+    Existing chains can be continued by listing their subj_ids in order of
+    generation, with chains separated by commas and generations by dashes.
+
+    Examples:
+
+        $ inv chains.create /Volumes/gems/chains.json --n-chains 6
+        $ inv chains.create chains.json --n-chains 2 --continue-from GEMS101-GEMS150,GEMS102
+
+    """
+    names = [chr(ord('A') + i) for i in range(int(n_chains))]
+    subj_ids = {}
+    if continue_from:
+        for name, chain in zip(names, continue_from.split(',')):
+            subj_ids[name] = chain.split('-')
+    ChainCoordinator(store).create(names, subj_ids)
+    status(ctx, store)
+
+
+@task
+def status(ctx, store):
+    """Show the next generation and current lease of every chain."""
+    row = '{chain:<8} {generation:>10} {inherit_from:>14} {station:>14} {leased_for:>12}'
+    print(row.format(chain='chain', generation='generation', inherit_from='inherit_from',
+                     station='station', leased_for='leased (s)'))
+    for slot in ChainCoordinator(store).status():
+        print(row.format(**slot))
+
+
+@task
+def release(ctx, store, chain, station):
+    """Release a station's lease on a chain, e.g. after a crashed session."""
+    ChainCoordinator(store).release(chain, station)
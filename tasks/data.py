@@ -0,0 +1,88 @@
+from invoke import task
+
+
+@task
+def replay(ctx, output=None, data_dir=None):
+    """Replay all trajectories and flag trials that don't match the landscape.
+
+    Examples:
+
+        $ inv data.replay
+        $ inv data.replay --output replayed.csv
+
+    """
+    from gems.data import load_data
+    from gems.replay import replay as replay_trials, summarize_flags
+
+    replayed = replay_trials(load_data(data_dir) if data_dir else load_data())
+    n_invalid = (~replayed.valid).sum()
+    print('{} of {} trials failed validation'.format(n_invalid, len(replayed)))
+
+    flags = summarize_flags(replayed)
+    if len(flags):
+        print(flags.to_string())
+
+    if output:
+        replayed.to_csv(output, index=False)
+
+
+@task
+def oracle(ctx, output='oracle.csv', data_dir=None):
+    """Add the best available scores and regret to every trial.
+
+    Examples:
+
+        $ inv data.oracle --output oracle.csv
+
+    """
+    from gems.data import load_data
+    from gems.oracle import add_oracle_metrics
+
+    trials = add_oracle_metrics(load_data(data_dir) if data_dir else load_data())
+    regret_columns = ['stim_regret', 'sight_regret', 'global_regret']
+    print(trials.groupby('block_ix')[regret_columns].mean().to_string())
+    trials.to_csv(output, index=False)
+
+
+@task
+def curves(ctx, output='learning-curves.csv', cache='learning-curves.pkl', data_dir=None):
+    """Summarize learning across the generations of each chain.
+
+    Session files that haven't changed since the last run are read from
+    the cache, and only the chains with new or changed subjects are
+    recomputed.
+
+    Examples:
+
+        $ inv data.curves
+
+    """
+    from gems.learning import LearningCurves
+
+    if data_dir:
+        curves = LearningCurves(data_dir, cache_file=cache)
+    else:
+        curves = LearningCurves(cache_file=cache)
+    updated = curves.update()
+    print('Updated {} chains'.format(len(updated)))
+
+    curves = curves.to_frame()
+    print(curves.groupby('generation')[['final_score', 'auc']].mean().to_string())
+    curves.to_csv(output, index=False)
+
+
+@task
+def synthesize(ctx, output_dir='synthetic-data', n_chains=10, n_generations=4, seed=0):
+    """Generate a synthetic dataset for testing analyses at scale.
+
+    Examples:
+
+        $ inv data.synthesize --n-chains 625 --n-generations 10  # 1M trials
+        $ inv data.replay --data-dir synthetic-data
+
+    """
+    from gems.synthetic import generate
+
+    n_trials = generate(output_dir, int(n_chains), int(n_generations), seed=int(seed))
+    print('Wrote {} trials from {} subjects to {}'.format(
+        n_trials, int(n_chains) * int(n_generations), output_dir))
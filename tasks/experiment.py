@@ -1,14 +1,11 @@
 from os import path, mkdir, listdir, remove
 from invoke import task
-import yaml
-import pandas
-import gems
-from gems import Experiment
 
 
 @task
 def show_texts(ctx, generation=1):
     """Show the instructions for the experiment."""
+    from gems.experiment import Experiment
     Experiment.win_size = (600 * 2.5, 400 * 2.5)
     experiment = Experiment(generation=generation)
     experiment.use_landscape('SimpleHill')
@@ -23,6 +20,7 @@ def show_texts(ctx, generation=1):
 @task
 def get_instructions(ctx):
     """Get instructions for the next generation."""
+    from gems.experiment import Experiment
     Experiment.win_size = (600 * 2.5, 400 * 2.5)
     experiment = Experiment(subj_id='GEMS100')
     instructions = experiment.get_instructions()
@@ -31,6 +29,7 @@ def get_instructions(ctx):
 
 @task
 def show_survey(ctx):
+    from gems.experiment import Experiment
     Experiment.win_size = (600 * 2.5, 400 * 2.5)
     experiment = Experiment(subj_id='GEMS100', computer='LL-Kramer')
     experiment.show_end()
@@ -39,6 +38,7 @@ def show_survey(ctx):
 @task
 def gui(ctx):
     """Open the subject info GUI and print the results."""
+    from gems.experiment import Experiment
     experiment = Experiment.from_gui('gui.yml')
     print(experiment.condition_vars)
 
@@ -46,6 +46,7 @@ def gui(ctx):
 @task
 def run_trial(ctx):
     """Run a single trial."""
+    from gems.experiment import Experiment
     Experiment.win_size = (600 * 2.5, 400 * 2.5)
     experiment = Experiment()
     experiment.use_landscape('SimpleHill')
@@ -57,6 +58,7 @@ def run_trial(ctx):
 @task
 def run_test_trials(ctx, n_test_trials=5):
     """Run test trials."""
+    from gems.experiment import Experiment
     Experiment.win_size = None
     Experiment.n_trials_per_block = n_test_trials
     output = 'test-trials.csv'
@@ -70,6 +72,7 @@ def run_test_trials(ctx, n_test_trials=5):
 @task
 def run_training_trials(ctx, n_training_trials=5, instructions_condition='orientation'):
     """Run training trials."""
+    from gems.experiment import Experiment
     Experiment.win_size = (600 * 2.5, 400 * 2.5)
     Experiment.n_training_trials = n_training_trials
     output = 'training-{}.csv'.format(instructions_condition)
@@ -77,3 +80,19 @@ def run_training_trials(ctx, n_training_trials=5, instructions_condition='orient
     experiment.use_landscape('SimpleHill')
     experiment.run_training_trials()
     experiment.quit()
+
+
+@task
+def monitor(ctx, interval=2.0, stall_seconds=60):
+    """Watch the progress of the sessions that are running.
+
+    Examples:
+
+        $ inv exp.monitor --interval 5
+
+    """
+    from gems.monitor import Monitor
+    try:
+        Monitor(stall_seconds=float(stall_seconds)).run(interval=float(interval))
+    except KeyboardInterrupt:
+        pass
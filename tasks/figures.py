@@ -1,6 +1,5 @@
 from os import path
 from invoke import task
-from psychopy import visual
 
 import gems
 
@@ -8,6 +7,8 @@ import gems
 @task
 def trial(ctx, move_to_r_pkg=False):
     """Draw a trial screen."""
+    from psychopy import visual
+
     win_size = (500, 500)
     gabor_size = 60
     display_radius = 120
@@ -1,22 +1,27 @@
 import sys
 
 from os import path, mkdir
+from glob import glob
 from itertools import product
 from invoke import task
 
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-
 import gems
+from gems.landscape import create_landscape
+from gems.specs import SPEC_EXTENSIONS
+
+from . import artifacts
 
 
 @task
-def data(ctx, name, move_to_r_pkg=False):
+def data(ctx, name, move_to_r_pkg=False, force=False):
     """Save the landscape to a tidy csv.
 
+    Landscapes that haven't changed since they were last saved are skipped.
+
     Examples:
 
         $ inv landscape.data SimpleHill
+        $ inv landscape.data all --force
 
     """
     landscapes = get_landscapes_from_name(name)
@@ -26,27 +31,32 @@ def data(ctx, name, move_to_r_pkg=False):
         if not path.isdir(landscapes_dir):
             mkdir(landscapes_dir)
 
+    jobs = []
     for name, landscape in landscapes.items():
         if move_to_r_pkg:
-            output = path.join(landscapes_dir, '{}.csv'.format(name))
+            output = path.join(landscapes_dir, '{}.csv'.format(get_output_name(name)))
         else:
-            output = path.join(gems.config.LANDSCAPE_FILES, '{}.csv'.format(name))
+            output = path.join(gems.config.LANDSCAPE_FILES, '{}.csv'.format(get_output_name(name)))
+        jobs.append((export_data, name, output, {}, artifacts.landscape_key(landscape, export_data)))
 
-        landscape.export(output)
+    artifacts.build(jobs, force=force)
+
+
+def export_data(name, output, settings):
+    create_landscape(name).export(output)
 
 
 @task
-def gabors(ctx, name, output=None, move_to_r_pkg=False, open_after=False, big=False):
+def gabors(ctx, name, output=None, move_to_r_pkg=False, open_after=False, big=False, force=False):
     """Draw gabors sampled from the landscape.
 
+    Landscapes that haven't changed since they were last drawn are skipped.
+
     Examples:
 
-        $ inv landscape.draw SimpleHill
+        $ inv landscape.gabors SimpleHill
 
     """
-    from psychopy import visual
-    from numpy import linspace
-
     if move_to_r_pkg:
         gabors_dir = '../data/inst/extdata'
         if not path.isdir(gabors_dir):
@@ -55,69 +65,123 @@ def gabors(ctx, name, output=None, move_to_r_pkg=False, open_after=False, big=Fa
     output_dir = gabors_dir if move_to_r_pkg else gems.config.GABORS_DIR
 
     if big:
-        size = (1250, 1250)
-        grid_size = 15
-        positions = linspace(0, 75, grid_size, endpoint=False, dtype='int')
+        settings = dict(size=(1250, 1250), grid_size=15, max_grid_pos=75, gabor_size=60)
         output_fmt = path.join(output_dir, '{}GemsBig.png')
     else:
-        size = (800, 800)
-        grid_size = 8
-        positions = linspace(0, 80, grid_size, endpoint=False, dtype='int')
+        settings = dict(size=(800, 800), grid_size=8, max_grid_pos=80, gabor_size=60)
         output_fmt = path.join(output_dir, '{}Gems.png')
 
-    win = visual.Window(size=size, units='pix', color=(0.6, 0.6, 0.6))
+    landscapes = get_landscapes_from_name(name)
+    jobs = []
+    for name, landscape in landscapes.items():
+        key = artifacts.landscape_key(landscape, render_gabors, settings)
+        jobs.append((render_gabors, name, output_fmt.format(get_output_name(name)), settings, key))
+
+    artifacts.build(jobs, force=force)
 
+    if open_after:
+        for _, _, output, _, _ in jobs:
+            ctx.run('open %s' % (output, ), echo=True)
+
+
+def render_gabors(name, output, settings):
+    from psychopy import visual
+    from numpy import linspace
+
+    grid_size = settings['grid_size']
+    gabor_size = settings['gabor_size']
+    positions = linspace(0, settings['max_grid_pos'], grid_size, endpoint=False, dtype='int')
+
+    win = visual.Window(size=settings['size'], units='pix', color=(0.6, 0.6, 0.6))
 
     grid_positions = list(product(positions, positions))
 
-    gabor_size = 60
     stim_positions = gems.create_grid_positions(n_rows=grid_size, n_cols=grid_size,
                                                 win_size=win.size,
                                                 stim_size=gabor_size)
 
+    landscape = create_landscape(name)
+    landscape.grating_stim_kwargs.update({'win': win, 'size': gabor_size})
+    gabors = landscape.get_grid_of_grating_stims(grid_positions)
+
+    for (grid_pos, stim_pos) in zip(grid_positions, stim_positions):
+        gabor = gabors[grid_pos]
+        gabor.pos = stim_pos
+        gabor.draw()
+
+        label = visual.TextStim(win, '%s' % (grid_pos, ), pos=(stim_pos[0], stim_pos[1]+gabor_size/2), alignVert='bottom')
+        label.draw()
+
+    win.flip()
+    win.getMovieFrame()
+    win.saveMovieFrames(output)
+    win.close()
+
+
+@task
+def draw(ctx, name, open_after=False, force=False, max_cells=10000):
+    """Draw the landscape as a 3D plot.
+
+    Large landscapes are drawn from a level of their mean-pooled pyramid
+    with at most max_cells cells. Landscapes that haven't changed since
+    they were last drawn are skipped.
+    """
+    settings = dict(n_contours=50, max_cells=int(max_cells))
+
     landscapes = get_landscapes_from_name(name)
+    jobs = []
     for name, landscape in landscapes.items():
-        landscape.grating_stim_kwargs.update({'win': win, 'size': gabor_size})
-        gabors = landscape.get_grid_of_grating_stims(grid_positions)
+        output = path.join(gems.config.LANDSCAPE_FILES, '{}Scores.png'.format(get_output_name(name)))
+        key = artifacts.landscape_key(landscape, render_scores, settings)
+        jobs.append((render_scores, name, output, settings, key))
 
-        for (grid_pos, stim_pos) in zip(grid_positions, stim_positions):
-            gabor = gabors[grid_pos]
-            gabor.pos = stim_pos
-            gabor.draw()
+    artifacts.build(jobs, force=force)
 
-            label = visual.TextStim(win, '%s' % (grid_pos, ), pos=(stim_pos[0], stim_pos[1]+gabor_size/2), alignVert='bottom')
-            label.draw()
+    if open_after:
+        for _, _, output, _, _ in jobs:
+            ctx.run('open {}'.format(output), echo=True)
 
-        win.flip()
-        win.getMovieFrame()
 
-        output = output_fmt.format(name)
-        win.saveMovieFrames(output)
+def render_scores(name, output, settings):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
+    from gems.pyramid import get_pyramid, choose_level, get_cell_centers
 
-        if open_after:
-            ctx.run('open %s' % (output, ), echo=True)
+    landscape = create_landscape(name)
+    level = choose_level(landscape, settings['max_cells'])
+    grid = get_pyramid(landscape, 'mean')[level]
+    x, y = get_cell_centers(level, landscape.dims)
+
+    fig = plt.figure()
+    ax = fig.add_subplot(111, projection='3d')
+    ax.contour3D(x, y, grid.T, settings['n_contours'])
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    ax.set_zlabel('score')
+
+    fig.savefig(output)
+    plt.close(fig)
 
 
 @task
-def draw(ctx, name, open_after=False):
-    """Draw the landscape as a 3D plot."""
-    landscapes = get_landscapes_from_name(name)
-    for name, landscape in landscapes.items():
-        data = landscape.to_tidy_data()
-        grid = data[['x', 'y', 'score']].pivot('x', 'y', 'score')
+def topology(ctx, name, radius=1):
+    """Summarize the local maxima, basins and ruggedness of landscapes.
 
-        fig = plt.figure()
-        ax = fig.add_subplot(111, projection='3d')
-        ax.contour3D(range(71), range(71), grid, 50)
-        ax.set_xlabel('x')
-        ax.set_ylabel('y')
-        ax.set_zlabel('score')
+    Examples:
 
-        output = path.join(gems.config.LANDSCAPE_FILES, '{}Scores.png'.format(name))
-        fig.savefig(output)
+        $ inv landscape.topology all --radius 10
 
-        if open_after:
-            ctx.run('open {}'.format(output), echo=True)
+    """
+    import pandas
+    from gems.topology import describe
+
+    landscapes = get_landscapes_from_name(name)
+    summary = pandas.DataFrame.from_dict(
+        {get_output_name(name): describe(landscape, int(radius)) for name, landscape in landscapes.items()},
+        orient='index')
+    print(summary.to_string())
 
 
 @task
@@ -126,19 +190,32 @@ def radius(ctx, grid_pos='10-10', sight_radius=8):
     grid_positions = gems.create_grid(sight_radius, sight_radius, centroid=pos_from_str(grid_pos))
 
 
-def get_landscapes_from_name(name):
-    if name == 'all':
-        names = ['SimpleHill', ]
-    else:
-        names = [name, ]
+def get_landscape_names(name):
+    """List the landscapes named by a class name, a spec file, or "all".
 
+    "all" is SimpleHill and every spec in the landscapes directory, which
+    are named by the stem of their spec file.
+    """
+    if name != 'all':
+        return [name, ]
+    specs = [spec for ext in SPEC_EXTENSIONS
+             for spec in glob(path.join(gems.config.LANDSCAPE_FILES, '*' + ext))]
+    return ['SimpleHill', ] + sorted(get_output_name(spec) for spec in specs)
+
+
+def get_landscapes_from_name(name):
+    """Create landscapes from a class name, a spec file, or "all"."""
     landscapes = {}
-    for name in names:
-        Landscape = getattr(gems.landscape, name, None)
-        if Landscape is None:
-            msg = "Landscape '{}' not found."
-            print(msg.format(name))
+    for name in get_landscape_names(name):
+        try:
+            landscapes[name] = create_landscape(name)
+        except ValueError as e:
+            print(e)
             sys.exit(1)
-        landscapes[name] = Landscape()
 
     return landscapes
+
+
+def get_output_name(name):
+    """Name the files made from a landscape, e.g. "TwoPeaks" for "specs/TwoPeaks.yml"."""
+    return path.splitext(path.basename(name))[0]
@@ -0,0 +1,61 @@
+import sys
+
+from invoke import task
+
+from gems import config, simulation
+from .landscape import get_landscape_names
+
+
+@task
+def sweep(ctx, landscapes='all', sight_radius=None, n_gabors=None, n_trials_per_block=None,
+          n_agents=1000, strategy='greedy', temperature=None, noise=None, seed=100,
+          n_workers=None, output='sweep.csv'):
+    """Simulate explorers across a grid of experiment parameters.
+
+    Parameters are given as comma separated values. "all" landscapes are
+    SimpleHill and every spec in the landscapes directory. Any parameter
+    left out is held at the default of the experiment in gems.config. The
+    temperature of "softmax" explorers and the noise of "noisy" explorers
+    can also be set. Conditions are run on all cores, each with its own
+    seeded random number generator, so a sweep with the same seed always
+    gives the same summary table.
+
+    Examples:
+
+        $ inv sim.sweep --sight-radius 4,8,12 --n-gabors 3,6,9
+        $ inv sim.sweep --landscapes SimpleHill --strategy softmax --temperature 10 --n-agents 100000
+
+    """
+    strategy_kwargs = {}
+    if temperature is not None:
+        strategy_kwargs['temperature'] = float(temperature)
+    if noise is not None:
+        strategy_kwargs['noise'] = float(noise)
+    expected = dict(temperature='softmax', noise='noisy')
+    for name in strategy_kwargs:
+        if strategy != expected[name]:
+            print('--{} only applies to the "{}" strategy'.format(name, expected[name]))
+            sys.exit(1)
+
+    landscape_names = [landscape_name for name in landscapes.split(',')
+                       for landscape_name in get_landscape_names(name)]
+
+    conditions = simulation.create_conditions(
+        landscape_names,
+        sight_radii=parse_int_list(sight_radius, config.SIGHT_RADIUS),
+        n_gabors=parse_int_list(n_gabors, config.N_GABORS),
+        n_trials_per_block=parse_int_list(n_trials_per_block, config.N_TRIALS_PER_BLOCK),
+    )
+    print('Simulating {} conditions of {} agents'.format(len(conditions), n_agents))
+
+    summary = simulation.run_sweep(conditions, n_agents=int(n_agents), strategy=strategy,
+                                   seed=int(seed), n_workers=n_workers and int(n_workers),
+                                   **strategy_kwargs)
+    summary.to_csv(output, index=False)
+    print('Saved sweep summary to {}'.format(output))
+
+
+def parse_int_list(values, default):
+    if values is None:
+        return [default, ]
+    return [int(value) for value in str(values).split(',')]
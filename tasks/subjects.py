@@ -1,18 +1,25 @@
 import itertools
 from invoke import task
-import pandas
 
 from tasks.googledrive import connect_google_sheets
 
 
 @task
-def update_subj_info(ctx):
+def update_subj_info(ctx, offline=None, refresh=False):
     """Update the subj info sheet with generation 2 starting positions.
 
+    Only the cells that changed since the last update are sent. The sheet
+    is cached in "subj-info-snapshot.json"; use --refresh if the sheet was
+    edited by hand since the last update. Use --offline to update a csv
+    instead of the Google Sheet.
+
     Assumes the pos lists have already been exported via:
 
         experiment/$ inv exp.write-pos-lists  # creates "pos-lists.txt"
     """
+    import pandas
+    from gems.sheets import SheetSync, GspreadBackend, LocalSheetBackend
+
     pos_lists = 'pos-lists.txt'
     pos_list_strs = [pos_list_str.strip() for pos_list_str in open(pos_lists)]
     pos_list_ixs = range(1, len(pos_list_strs))
@@ -24,16 +31,17 @@ def update_subj_info(ctx):
         columns=['starting_pos_list_ix', 'instructions_condition']
     ).sort_values(['starting_pos_list_ix', 'instructions_condition'])
 
-    gc = connect_google_sheets()
-    wb = gc.open('gems-subj-info')
-    ws = wb.worksheet('generation2')
-
-    cells = ws.range('D2:D{}'.format(2+len(subj_info.instructions_condition)))
-    for cell, value in zip(cells, subj_info.instructions_condition):
-        cell.value = value
-    ws.update_cells(cells)
-
-    cells = ws.range('E2:E{}'.format(2+len(subj_info.starting_pos_list_ix)))
-    for cell, value in zip(cells, subj_info.starting_pos_list_ix):
-        cell.value = value
-    ws.update_cells(cells)
+    if offline:
+        sync = SheetSync(LocalSheetBackend(offline))
+    else:
+        gc = connect_google_sheets()
+        wb = gc.open('gems-subj-info')
+        sync = SheetSync(GspreadBackend(wb.worksheet('generation2')),
+                         'subj-info-snapshot.json')
+    if refresh:
+        sync.pull()
+
+    sync.set_column('D2', subj_info.instructions_condition)
+    sync.set_column('E2', subj_info.starting_pos_list_ix)
+    changed = sync.push()
+    print('Updated {} cells'.format(len(changed)))
@@ -0,0 +1,54 @@
+import pytest
+
+pytest.importorskip('invoke')
+
+import inspect
+
+from gems import specs
+from gems.landscape import SimpleHill
+from tasks import artifacts
+
+
+def edit_source(monkeypatch, edited):
+    getsource = inspect.getsource
+    monkeypatch.setattr(artifacts.inspect, 'getsource',
+                        lambda obj: getsource(obj) + ('# edited' if obj is edited else ''))
+
+def test_key_is_stable():
+    assert artifacts.landscape_key(SimpleHill(), _write_output) == artifacts.landscape_key(SimpleHill(), _write_output)
+
+def test_key_changes_with_parameters_and_settings():
+    key = artifacts.landscape_key(SimpleHill(), _write_output, dict(n_contours=50))
+    assert key != artifacts.landscape_key(SimpleHill(normalize=False), _write_output, dict(n_contours=50))
+    assert key != artifacts.landscape_key(SimpleHill(), _write_output, dict(n_contours=20))
+    assert key != artifacts.landscape_key(SimpleHill(), _write_name, dict(n_contours=50))
+
+def test_key_changes_with_source_of_build_function(monkeypatch):
+    key = artifacts.landscape_key(SimpleHill(), _write_output)
+    edit_source(monkeypatch, _write_output)
+    assert artifacts.landscape_key(SimpleHill(), _write_output) != key
+
+def test_spec_key_changes_with_source_of_specs(monkeypatch):
+    landscape = specs.SpecLandscape(dict(n_rows=11, n_cols=11, score=[dict(hill=dict(x=5, y=5))]))
+    spec_key = artifacts.landscape_key(landscape, _write_output)
+    simple_hill_key = artifacts.landscape_key(SimpleHill(), _write_output)
+    edit_source(monkeypatch, specs)
+    assert artifacts.landscape_key(landscape, _write_output) != spec_key
+    assert artifacts.landscape_key(SimpleHill(), _write_output) == simple_hill_key
+
+def test_build_skips_up_to_date_outputs(tmpdir):
+    output = str(tmpdir.join('SimpleHill.csv'))
+    jobs = [(_write_output, 'SimpleHill', output, {}, 'key1')]
+    assert artifacts.build(jobs) == [output]
+    assert artifacts.build(jobs) == []
+    assert artifacts.build(jobs, force=True) == [output]
+    jobs = [(_write_output, 'SimpleHill', output, {}, 'key2')]
+    assert artifacts.build(jobs) == [output]
+
+def _write_output(name, output, settings):
+    with open(output, 'w') as f:
+        f.write(name)
+
+def _write_name(name, output, settings):
+    with open(output, 'w') as f:
+        f.write(name)
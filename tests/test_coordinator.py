@@ -0,0 +1,52 @@
+import pytest
+
+from gems.coordinator import ChainCoordinator, ChainsUnavailable, LeaseLost
+
+
+@pytest.fixture
+def chains(tmpdir):
+    coordinator = ChainCoordinator(str(tmpdir.join('chains.json')))
+    coordinator.create(['A', 'B'], subj_ids={'B': ['GEMS101']})
+    return coordinator
+
+def test_lease_chain_with_fewest_generations(chains):
+    slot = chains.lease('Kramer')
+    assert slot == dict(chain='A', generation=1, inherit_from='')
+    slot = chains.lease('Elaine')
+    assert slot == dict(chain='B', generation=2, inherit_from='GEMS101')
+
+def test_station_keeps_its_lease(chains):
+    assert chains.lease('Kramer') == chains.lease('Kramer')
+
+def test_all_chains_leased(chains):
+    chains.lease('Kramer')
+    chains.lease('Elaine')
+    with pytest.raises(ChainsUnavailable):
+        chains.lease('George')
+
+def test_complete_advances_chain(chains):
+    slot = chains.lease('Kramer')
+    chains.complete(slot['chain'], 'GEMS102', 'Kramer')
+    slot = chains.lease('Elaine')
+    assert slot == dict(chain='A', generation=2, inherit_from='GEMS102')
+
+def test_abandoned_leases_are_reclaimed(chains):
+    chains.lease('Kramer')
+    chains.lease('Elaine')
+    chains.lease_timeout = 0
+    assert chains.lease('George')['chain'] == 'A'
+
+def test_expired_lease_can_be_completed_until_reclaimed(chains):
+    slot = chains.lease('Kramer')
+    chains.lease_timeout = 0
+    chains.complete(slot['chain'], 'GEMS102', 'Kramer')
+    assert chains.read()['A']['subj_ids'] == ['GEMS102']
+
+def test_reclaimed_lease_cannot_be_completed(chains):
+    slot = chains.lease('Kramer')
+    chains.lease_timeout = 0
+    assert chains.lease('George')['chain'] == slot['chain']
+    with pytest.raises(LeaseLost):
+        chains.complete(slot['chain'], 'GEMS102', 'Kramer')
+    chains.complete(slot['chain'], 'GEMS103', 'George')
+    assert chains.read()['A']['subj_ids'] == ['GEMS103']
@@ -0,0 +1,13 @@
+from gems.config import data_columns
+from gems.data import read_subj_data
+
+
+def test_read_sessions_from_before_sampling_was_recorded(tmpdir):
+    columns = [col for col in data_columns if col != 'sampling']
+    values = dict(subj_id='GEMS100', generation='1', sight_radius='10', n_gabors='6',
+                  block_ix='1', trial='0', pos='0-0', stims='1-1;2-2', selected='1-1')
+    session = tmpdir.join('GEMS100.csv')
+    session.write(','.join(columns) + '\n' + ','.join(values.get(col, '0') for col in columns) + '\n')
+    trials = read_subj_data(str(session))
+    assert trials.columns.tolist() == data_columns
+    assert trials.sampling.tolist() == ['uniform']
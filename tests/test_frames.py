@@ -0,0 +1,61 @@
+from gems.frames import FrameScheduler
+
+
+class FakeWindow(object):
+    """A 60Hz window whose flips land on the next frame."""
+    def __init__(self, clock):
+        self.clock = clock
+
+    def getActualFrameRate(self):
+        return 60.0
+
+    def flip(self):
+        frame = 1/60.0
+        self.clock.now = (int(self.clock.now / frame + 1e-9) + 1) * frame
+        return self.clock.now
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def get_time(self):
+        return self.now
+
+    def wait(self, seconds):
+        self.now += seconds + 0.004  # oversleep
+
+
+def make_frames():
+    clock = FakeClock()
+    return FrameScheduler(FakeWindow(clock), get_time=clock.get_time, wait=clock.wait)
+
+def test_durations_are_rounded_to_frames():
+    frames = make_frames()
+    assert frames.n_frames(1.0) == 60
+    assert frames.n_frames(0.021) == 1
+    assert frames.n_frames(0) == 1
+
+def test_hold_lands_on_target_frame():
+    frames = make_frames()
+    for _ in range(3):
+        frames.flip()
+        frames.hold('fix', 0.5)
+        frames.flip()
+    (name, n, target, mean, max_error), = frames.summarize()
+    assert (name, n) == ('fix', 3)
+    assert abs(target - 0.5) < 1e-9
+    assert max_error < 1e-6
+
+def test_hold_until_flip_includes_preparing_the_next_screen():
+    frames = make_frames()
+    frames.flip()
+    frames.hold_until_flip('iti', 0.5)
+    frames.wait(0.2)  # create and draw the stims of the next trial
+    frames.flip()
+    frames.hold_until_flip('iti', 0.5)
+    frames.wait(0.7)  # preparing took longer than the iti
+    frames.flip()
+    achieved = [record[3] for record in frames.records]
+    assert abs(achieved[0] - 0.5) < 1e-6
+    assert abs(achieved[1] - (0.7 + 0.004 + 1/60.0)) < 1/60.0
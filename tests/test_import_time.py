@@ -0,0 +1,42 @@
+import sys
+import subprocess
+
+import pytest
+
+from gems.config import EXP_ROOT
+
+# Modules that must be importable without loading presentation libraries
+IMPORTS = [
+    'gems',
+    'tasks',  # loaded by `inv --list`
+    'gems.data, gems.replay, gems.oracle, gems.topology, gems.simulation',
+]
+
+PRESENTATION_MODULES = ['psychopy', 'pyglet', 'matplotlib', 'gspread']
+
+# Seconds to import each entry of IMPORTS. They take a few tenths of a
+# second, and several seconds when they load psychopy.
+IMPORT_TIME_BUDGET = 2.0
+
+
+def measure_import(modules):
+    """Import modules in a new interpreter, returning (loaded modules, seconds)."""
+    code = ('import sys, time; start = time.time(); import {}; '
+            'print(time.time() - start); print(",".join(sys.modules))')
+    output = subprocess.check_output([sys.executable, '-c', code.format(modules)], cwd=EXP_ROOT)
+    seconds, loaded = output.decode().strip().split('\n')
+    return set(loaded.split(',')), float(seconds)
+
+@pytest.mark.parametrize('modules', IMPORTS)
+def test_imports_defer_presentation_modules(modules):
+    if modules == 'tasks':
+        pytest.importorskip('invoke')
+    loaded, seconds = measure_import(modules)
+    assert not set(name.split('.')[0] for name in loaded).intersection(PRESENTATION_MODULES)
+    assert 'psychopy.visual' not in loaded
+    assert 'gems.experiment' not in loaded
+    assert seconds < IMPORT_TIME_BUDGET
+
+def test_import_gems_defers_pandas():
+    loaded, _ = measure_import('gems')
+    assert 'pandas' not in loaded
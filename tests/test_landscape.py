@@ -1,4 +1,4 @@
-from gems import Landscape, SimpleHill
+from gems import Landscape, SimpleHill, FeatureSpaceLandscape
 
 
 def test_convert_landscape_to_tidy_data():
@@ -34,3 +34,29 @@ def test_get_neighbors_ignore_those_off_map():
     neighbors = landscape.get_neighborhood((0, 0), radius=1)
     assert len(neighbors) == 3
     assert set(neighbors) == set([(0,0), (0,1), (1,0)])
+
+def test_feature_space_neighborhood_matches_brute_force():
+    landscape = FeatureSpaceLandscape.from_jittered_grid(n_rows=20, n_cols=20, seed=100,
+                                                         score_func=lambda (x,y): 1)
+    neighbors = landscape.get_neighborhood((10.5, 10.5), 3)
+    expected = [pos for pos in landscape.grid_positions
+                if landscape.is_position_within_radius((10.5, 10.5), pos, 3)]
+    assert sorted(neighbors) == sorted(expected)
+
+def test_feature_space_sample_gabors_contract():
+    landscape = FeatureSpaceLandscape([(0, 0), (0.5, 1.25), (3, 3)], scores=[1, 2, 3])
+    sampled = landscape.sample_neighborhood(6, (0, 0), 2)
+    assert sorted(sampled) == [(0.0, 0.0), (0.5, 1.25)]
+    assert landscape.score((2.9, 3.1)) == 3
+
+def test_get_gabors_matches_get_gabor():
+    landscape = SimpleHill()
+    positions = [(0, 0), (10, 35), (70, 70)]
+    gabors = landscape.get_gabors(positions)
+    for pos, ori, sf in zip(positions, gabors.ori, gabors.sf):
+        assert (ori, sf) == landscape.get_gabor(pos)
+
+def test_feature_axes_are_cached():
+    landscape = SimpleHill()
+    assert landscape.orientations is landscape.orientations
+    assert landscape.spatial_frequencies is landscape.spatial_frequencies
@@ -0,0 +1,46 @@
+import pandas
+
+from gems.config import data_columns
+from gems.learning import LearningCurves, assign_chains
+
+
+def write_subj(data_dir, subj_id, generation, inherit_from, scores):
+    trials = pandas.DataFrame(dict(
+        subj_id=subj_id, generation=generation, inherit_from=inherit_from,
+        sight_radius=10, n_gabors=6, block_ix=1, trial=range(len(scores)),
+        score=scores, delta=pandas.Series(scores).diff().fillna(scores[0]),
+    ), columns=data_columns)
+    trials.to_csv(str(data_dir.join(subj_id + '.csv')), index=False)
+
+
+def test_assign_chains_follows_inherit_from():
+    summaries = {'GEMS101': dict(inherit_from=''),
+                 'GEMS102': dict(inherit_from='GEMS101'),
+                 'GEMS103': dict(inherit_from='GEMS102'),
+                 'GEMS104': dict(inherit_from='GEMS999')}
+    assert assign_chains(summaries) == {'GEMS101': 'GEMS101', 'GEMS102': 'GEMS101',
+                                        'GEMS103': 'GEMS101', 'GEMS104': 'GEMS104'}
+
+def test_update_recomputes_only_affected_chains(tmpdir):
+    write_subj(tmpdir, 'GEMS101', 1, '', [10, 20, 30])
+    write_subj(tmpdir, 'GEMS102', 1, '', [5, 5, 5])
+    cache_file = str(tmpdir.join('curves.pkl'))
+
+    assert LearningCurves(str(tmpdir), cache_file).update() == ['GEMS101', 'GEMS102']
+    assert LearningCurves(str(tmpdir), cache_file).update() == []
+
+    write_subj(tmpdir, 'GEMS103', 2, 'GEMS101', [30, 40, 50])
+    curves = LearningCurves(str(tmpdir), cache_file)
+    assert curves.update() == ['GEMS101']
+
+    chain = curves.to_frame().query('chain == "GEMS101"')
+    assert chain.subj_id.tolist() == ['GEMS101', 'GEMS103']
+    assert chain.final_score.tolist() == [30, 50]
+    assert chain.auc.tolist() == [20, 40]
+
+def test_update_skips_sessions_without_trials(tmpdir):
+    write_subj(tmpdir, 'GEMS101', 1, '', [10, 20, 30])
+    tmpdir.join('GEMS102.csv').write(','.join(data_columns) + '\n')
+    curves = LearningCurves(str(tmpdir))
+    assert curves.update() == ['GEMS101']
+    assert curves.to_frame().subj_id.tolist() == ['GEMS101']
@@ -0,0 +1,19 @@
+from gems import SimpleHill
+from gems.memory import MemoryTracker
+
+
+def test_disabled_tracker_takes_no_snapshots():
+    memory = MemoryTracker()
+    memory.snapshot('start')
+    assert memory.snapshots == []
+
+def test_growth_counts_landscape_caches():
+    memory = MemoryTracker(enabled=True)
+    landscape = SimpleHill()
+    memory.snapshot('start')
+    landscape.get_score_grid()
+    memory.snapshot('scored')
+
+    growth = memory.growth(*memory.snapshots)
+    assert dict(growth['caches'])['scores'] == 71 * 71
+    assert 'start -> scored' in memory.format_report()
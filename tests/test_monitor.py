@@ -0,0 +1,27 @@
+from gems.monitor import Monitor, SessionTail
+
+HEADER = 'subj_id,computer,block_ix,trial,rt,score\n'
+
+
+def test_tail_reads_only_complete_new_lines(tmpdir):
+    session = tmpdir.join('GEMS101.csv')
+    session.write(HEADER + 'GEMS101,Kramer,1,0,2.5,10\nGEMS101,Kra')
+    tail = SessionTail(str(session))
+    assert [row['trial'] for row in tail.read_new()] == ['0']
+
+    session.write('mer,1,1,3.5,20\n', mode='a')
+    rows = tail.read_new()
+    assert [row['computer'] for row in rows] == ['Kramer']
+    assert tail.read_new() == []
+
+def test_monitor_tracks_sessions(tmpdir):
+    session = tmpdir.join('GEMS101.csv')
+    session.write(HEADER + 'GEMS101,Kramer,1,0,2.0,10\nGEMS101,Kramer,1,1,4.0,20\n')
+    monitor = Monitor(str(tmpdir), stall_seconds=60)
+    assert monitor.poll(now=100) == 2
+
+    stats, = monitor.sessions.values()
+    assert (stats.computer, stats.trial, stats.score) == ('Kramer', '1', '20')
+    assert stats.median_rt == 3.0
+    assert not monitor.is_stalled(stats, now=150)
+    assert monitor.is_stalled(stats, now=200)
@@ -0,0 +1,46 @@
+import pandas
+import pytest
+
+from gems import Landscape, SimpleHill
+from gems.data import load_data
+from gems.oracle import add_oracle_metrics, get_radius_max_grid
+from gems.synthetic import generate
+from gems.util import parse_pos, parse_pos_list
+
+
+def test_radius_max_grid_matches_neighborhood_max():
+    landscape = Landscape(n_rows=10, n_cols=10, score_func=lambda (x,y): (x*7 + y*3) % 10)
+    radius_max = get_radius_max_grid(landscape, 2)
+    for pos in [(0, 0), (4, 5), (9, 9)]:
+        neighbors = landscape.get_neighborhood(pos, 2)
+        assert radius_max[pos] == max(landscape.score(p) for p in neighbors)
+
+def test_radius_max_grid_is_cached():
+    landscape = SimpleHill()
+    assert get_radius_max_grid(landscape, 10) is get_radius_max_grid(landscape, 10)
+
+def test_oracle_metrics_match_brute_force(tmpdir):
+    generate(str(tmpdir), n_chains=2, n_generations=1, n_trials_per_block=5)
+    trials = load_data(str(tmpdir))
+    trials.loc[0, 'stims'] += ';80-80'  # off the grid
+    metrics = add_oracle_metrics(trials)
+
+    landscape = SimpleHill()
+    for _, trial in metrics.iterrows():
+        pos = parse_pos(trial.pos)
+        stims = [stim for stim in parse_pos_list(trial.stims) if landscape.is_position_on_grid(stim)]
+        sight = landscape.get_neighborhood(pos, trial.sight_radius)
+        assert trial.best_stim_score == max(landscape.score(stim) for stim in stims)
+        assert trial.best_sight_score == max(landscape.score(p) for p in sight)
+        assert trial.global_max_score == landscape.get_score_grid().max()
+        assert trial.stim_regret == trial.best_stim_score - trial.score
+        assert trial.sight_regret == trial.best_sight_score - trial.score
+        assert trial.global_regret == trial.global_max_score - trial.score
+    assert (metrics.stim_regret >= 0).all()
+    assert metrics.columns.tolist()[:len(trials.columns)] == trials.columns.tolist()
+
+def test_oracle_rejects_feature_space_landscapes():
+    trials = pandas.DataFrame(dict(landscape_name=['JitteredSimpleHill'], sight_radius=[10],
+                                   pos=['0.1-0.2'], stims=['1.5-2.25'], score=[0]))
+    with pytest.raises(ValueError):
+        add_oracle_metrics(trials)
@@ -0,0 +1,32 @@
+import numpy
+
+from gems import Landscape, SimpleHill
+from gems.pyramid import get_pyramid, find_best_positions, choose_level, get_cell_slices, to_level
+
+
+def test_pyramid_pools_blocks_of_cells():
+    landscape = Landscape(n_rows=5, n_cols=5, score_func=lambda (x,y): x*5 + y)
+    grid = landscape.get_score_grid()
+    maxes = get_pyramid(landscape, 'max')
+    means = get_pyramid(landscape, 'mean')
+    assert [level.shape for level in maxes] == [(5, 5), (3, 3), (2, 2), (1, 1)]
+    assert maxes[1][2, 2] == grid[4, 4]
+    assert means[1][0, 0] == grid[:2, :2].mean()
+    assert means[-1][0, 0] == grid.mean()
+
+def test_cells_cover_their_positions():
+    landscape = SimpleHill()
+    maxes = get_pyramid(landscape, 'max')
+    cell = tuple(to_level((35, 40), 3))
+    block = landscape.get_score_grid()[get_cell_slices(cell, 3, landscape.dims)]
+    assert maxes[3][cell] == block.max()
+
+def test_find_best_positions_matches_full_search():
+    landscape = SimpleHill()
+    grid = landscape.get_score_grid()
+    best = find_best_positions(landscape, 90)
+    assert best.tolist() == numpy.argwhere(grid >= 90).tolist()
+
+def test_choose_level():
+    assert choose_level(SimpleHill(), 10000) == 0
+    assert choose_level(SimpleHill(), 100) == 3
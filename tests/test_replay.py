@@ -0,0 +1,83 @@
+import numpy
+import pandas
+import pytest
+
+from gems.replay import replay
+from gems.util import (parse_pos_column, parse_pos_list_column, pos_to_code, code_to_pos,
+                       format_pos_column, format_pos_list_column)
+
+
+def make_trials(**kwargs):
+    trials = dict(
+        subj_id=['GEMS100', 'GEMS100'], block_ix=[1, 1], trial=[0, 1],
+        landscape_name=['SimpleHill', 'SimpleHill'], sight_radius=[10, 10],
+        starting_pos=['0-0', '0-0'], starting_score=[0, 0],
+        pos=['0-0', '2-4'], stims=['2-2;2-4;1-3', '0-5;8-5;3-6'],
+        selected=['2-4', '8-5'], score=[11, 24], delta=[11, 13],
+    )
+    trials.update(kwargs)
+    return pandas.DataFrame(trials)
+
+def test_parse_pos_column():
+    positions = parse_pos_column(pandas.Series(['0-1', '10-20']))
+    assert positions.tolist() == [[0, 1], [10, 20]]
+
+def test_parse_pos_list_column_pads_short_lists():
+    positions = parse_pos_list_column(pandas.Series(['0-1;2-3', '4-5']))
+    assert positions.tolist() == [[[0, 1], [2, 3]], [[4, 5], [-1, -1]]]
+
+def test_parse_pos_list_column_decimal_positions():
+    positions = parse_pos_list_column(pandas.Series(['10.37-5.2;0.5-1', '3-4']))
+    assert positions.dtype == float
+    assert positions.tolist() == [[[10.37, 5.2], [0.5, 1.0]], [[3.0, 4.0], [-1.0, -1.0]]]
+    assert parse_pos_column(pandas.Series(['10.37-5.2'])).tolist() == [[10.37, 5.2]]
+
+def test_parse_pos_list_column_unicode():
+    positions = parse_pos_list_column(pandas.Series([u'1-2;3-4', u'5-6']))
+    assert positions.tolist() == [[[1, 2], [3, 4]], [[5, 6], [-1, -1]]]
+
+@pytest.mark.parametrize('malformed', ['1-2-3', '1-2;;3-4', '12', '1-'])
+def test_parse_pos_list_column_rejects_malformed_rows(malformed):
+    with pytest.raises(ValueError) as exc_info:
+        parse_pos_list_column(pandas.Series(['0-1', malformed, '4-5']))
+    assert 'row 1' in str(exc_info.value)
+
+def test_replay_valid_trials():
+    replayed = replay(make_trials())
+    assert replayed.valid.all()
+    assert replayed.expected_score.tolist() == [11, 24]
+
+def test_replay_flags_mismatches():
+    replayed = replay(make_trials(
+        pos=['0-0', '2-3'],
+        stims=['2-2;2-4;1-3', '0-5;8-5;30-30'],
+        selected=['2-4', '9-5'],
+    ))
+    flagged = replayed.iloc[1]
+    assert flagged.pos_not_continuous
+    assert flagged.selected_not_in_stims
+    assert flagged.stims_outside_radius
+    assert flagged.score_mismatch
+    assert not replayed.iloc[0].pos_not_continuous
+
+def test_replay_rejects_feature_space_landscapes():
+    trials = make_trials(landscape_name=['JitteredSimpleHill'] * 2,
+                         pos=['0-0', '2.1-3.95'], selected=['2.1-3.95', '8.03-5.2'])
+    with pytest.raises(ValueError):
+        replay(trials)
+
+def test_parse_pos_list_column_missing_lists():
+    positions = parse_pos_list_column(pandas.Series(['0-1', None, '']))
+    assert positions.tolist() == [[[0, 1]], [[-1, -1]], [[-1, -1]]]
+
+def test_pos_codes_round_trip():
+    positions = numpy.array([[0, 1], [2, 3], [-1, -1], [5, 0]])
+    codes = pos_to_code(positions, (5, 4))
+    assert codes.tolist() == [1, 11, -1, -1]
+    assert code_to_pos(codes, (5, 4)).tolist() == [[0, 1], [2, 3], [-1, -1], [-1, -1]]
+
+def test_format_pos_list_column_round_trip():
+    str_pos_lists = pandas.Series(['2-2;2-4;1-3', '0-5;8-5', '70-70'])
+    positions = parse_pos_list_column(str_pos_lists)
+    assert format_pos_list_column(positions, (71, 71)).tolist() == str_pos_lists.tolist()
+    assert format_pos_column(positions[:, 0], (71, 71)).tolist() == ['2-2', '0-5', '70-70']
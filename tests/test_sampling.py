@@ -0,0 +1,80 @@
+import numpy
+import pytest
+
+from gems import Landscape, FeatureSpaceLandscape
+from gems import sampling
+from gems.sampling import SAMPLING_MODES, create_stratified_table, create_poisson_table
+
+
+def create_landscape(mode, seed=100):
+    landscape = Landscape(n_rows=71, n_cols=71, score_func=lambda (x,y): 1, seed=seed)
+    landscape.set_sampling(mode)
+    return landscape
+
+def min_distance(positions):
+    positions = numpy.array(positions)
+    distances = numpy.sqrt(((positions[:, numpy.newaxis] - positions)**2).sum(axis=2))
+    return distances[numpy.triu_indices(len(positions), 1)].min()
+
+@pytest.mark.parametrize('mode', SAMPLING_MODES)
+@pytest.mark.parametrize('grid_pos', [(35, 35), (0, 0), (70, 35), (3, 68)])
+def test_samples_are_distinct_neighbors_on_the_grid(mode, grid_pos):
+    landscape = create_landscape(mode)
+    neighborhood = set(landscape.get_neighborhood(grid_pos, 10))
+    for _ in range(50):
+        sampled = landscape.sample_neighborhood(6, grid_pos, 10)
+        assert len(sampled) == len(set(sampled)) == 6
+        assert set(sampled) <= neighborhood
+
+def test_spread_samples_are_farther_apart_than_uniform():
+    mean_min_distances = {}
+    for mode in SAMPLING_MODES:
+        landscape = create_landscape(mode)
+        mean_min_distances[mode] = numpy.mean([min_distance(landscape.sample_neighborhood(6, (35, 35), 10))
+                                               for _ in range(200)])
+    assert mean_min_distances['stratified'] > mean_min_distances['uniform']
+    assert mean_min_distances['poisson'] > mean_min_distances['stratified']
+
+def test_stratified_table_has_a_stratum_per_sample():
+    offsets, strata = create_stratified_table(10, 6)
+    assert strata.shape[1] == len(offsets)
+    for stratum in strata:
+        assert set(stratum) == set(range(-1, 6))
+
+def test_poisson_patterns_are_spread_out():
+    patterns = create_poisson_table(10, 6)
+    assert patterns.shape[1:] == (6, 2)
+    assert min(min_distance(pattern) for pattern in patterns) > 4
+
+def test_poisson_keeps_the_try_with_most_positions_on_the_grid():
+    dims, corner = (71, 71), numpy.array([0, 0])
+    patterns = sampling.get_table('poisson', 10, 6)
+    n_best_not_first = 0
+    for seed in range(20):
+        # Replay the draws of each try to find the pattern that should win
+        prng = numpy.random.RandomState(seed)
+        tries = []
+        for _ in range(sampling.max_tries):
+            pattern = sampling._transform(patterns[prng.randint(len(patterns))],
+                                          sampling.SYMMETRIES[prng.randint(len(sampling.SYMMETRIES))])
+            positions = corner + pattern
+            tries.append(positions[sampling._is_on_grid(positions, dims)])
+        counts = [len(positions) for positions in tries]
+        best = tries[counts.index(max(counts))]
+        n_best_not_first += max(counts) > counts[0]
+
+        sampled = sampling._sample_poisson(dims, corner, 10, 6, numpy.random.RandomState(seed))
+        assert set(map(tuple, best.tolist())) <= set(map(tuple, sampled.tolist()))
+    assert n_best_not_first > 0
+
+def test_sampling_uses_landscape_prng():
+    samples = [create_landscape('poisson', seed=1).sample_neighborhood(6, (35, 35), 10) for _ in range(2)]
+    assert samples[0] == samples[1]
+
+def test_unknown_sampling_mode_raises():
+    with pytest.raises(ValueError):
+        create_landscape('clumped')
+    landscape = FeatureSpaceLandscape.from_jittered_grid(n_rows=10, n_cols=10, seed=100,
+                                                         score_func=lambda (x,y): 1)
+    with pytest.raises(ValueError):
+        landscape.set_sampling('stratified')
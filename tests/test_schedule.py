@@ -0,0 +1,31 @@
+import pytest
+
+from gems.schedule import LandscapeSchedule
+
+
+def test_schedule_builds_landscapes_for_every_block():
+    schedule = LandscapeSchedule(['SimpleHill', 'JitteredSimpleHill'])
+    schedule.start()
+    landscapes = [schedule.get(block_ix) for block_ix in range(len(schedule))]
+    assert [l.__class__.__name__ for l in landscapes] == ['SimpleHill', 'JitteredSimpleHill']
+    assert all(seconds is not None for seconds in schedule.build_times)
+
+def test_schedule_raises_build_errors_when_block_is_needed():
+    schedule = LandscapeSchedule(['SimpleHill', 'NotALandscape'])
+    assert schedule.get(0).__class__.__name__ == 'SimpleHill'
+    with pytest.raises(ValueError) as exc_info:
+        schedule.get(1)
+    assert exc_info.traceback[-1].name == 'create_landscape'  # raised with the traceback of the build
+
+class BuildError(Exception):
+    def __init__(self, name, reason):
+        super(BuildError, self).__init__('{}: {}'.format(name, reason))
+
+class BrokenSchedule(LandscapeSchedule):
+    def build(self, name):
+        raise BuildError(name, 'broken')
+
+def test_schedule_raises_errors_that_take_several_arguments():
+    schedule = BrokenSchedule(['SimpleHill'])
+    with pytest.raises(BuildError):
+        schedule.get(0)
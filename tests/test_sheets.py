@@ -0,0 +1,39 @@
+import pytest
+
+from gems.sheets import SheetSync, LocalSheetBackend, parse_a1
+
+
+@pytest.fixture
+def sheet(tmpdir):
+    sheet_csv = tmpdir.join('sheet.csv')
+    sheet_csv.write('subj_id,instructions_condition\nGEMS101,orientation\n')
+    return LocalSheetBackend(str(sheet_csv))
+
+
+def test_parse_a1():
+    assert parse_a1('A1') == (1, 1)
+    assert parse_a1('E12') == (12, 5)
+    assert parse_a1('AA3') == (3, 27)
+
+def test_push_sends_only_changed_cells(sheet):
+    sync = SheetSync(sheet)
+    sync.set_column('B2', ['orientation', 'spatial_frequency'])
+    assert sync.push() == [(3, 2, 'spatial_frequency')]
+    assert sheet.n_updates == 1
+    assert sheet.get_all_values()[2] == ['', 'spatial_frequency']
+
+def test_push_unchanged_is_noop(sheet):
+    sync = SheetSync(sheet)
+    sync.set_row('A2', ['GEMS101', 'orientation'])
+    assert sync.push() == []
+    assert sheet.n_updates == 0
+
+def test_snapshot_is_cached_locally(sheet, tmpdir):
+    snapshot_file = str(tmpdir.join('snapshot.json'))
+    SheetSync(sheet, snapshot_file).snapshot
+    sheet.update_cells([(2, 2, 'changed elsewhere')])
+
+    sync = SheetSync(sheet, snapshot_file)
+    assert sync.get(2, 2) == 'orientation'
+    sync.pull()
+    assert sync.get(2, 2) == 'changed elsewhere'
@@ -0,0 +1,47 @@
+import numpy
+
+from gems import Landscape, SimpleHill
+from gems import simulation
+from gems.simulation import simulate, sample_neighborhoods
+from gems.util import create_neighborhood_offsets
+
+
+def test_neighborhood_offsets_match_get_neighborhood():
+    landscape = Landscape(n_rows=11, n_cols=11, score_func=lambda (x,y): 1)
+    offsets = create_neighborhood_offsets(3)
+    neighbors = [(5+dx, 5+dy) for dx, dy in offsets]
+    assert neighbors == landscape.get_neighborhood((5, 5), 3)
+
+def test_sample_neighborhoods_are_unique_and_within_radius():
+    positions = numpy.array([[0, 0], [5, 5], [9, 9]])
+    prng = numpy.random.RandomState(100)
+    samples = sample_neighborhoods((10, 10), positions, 6, create_neighborhood_offsets(3), prng)
+    assert samples.shape == (3, 6, 2)
+    for pos, stims in zip(positions, samples):
+        assert len(set(map(tuple, stims))) == 6
+        assert (((stims - pos)**2).sum(axis=1) <= 9).all()
+        assert ((stims >= 0) & (stims < 10)).all()
+
+def test_sample_neighborhoods_pads_small_neighborhoods():
+    prng = numpy.random.RandomState(100)
+    samples = sample_neighborhoods((3, 3), numpy.array([[0, 0]]), 6, create_neighborhood_offsets(1), prng)
+    assert set(map(tuple, samples[0])) == set([(0, 0), (0, 1), (1, 0), (-1, -1)])
+
+def test_simulate_greedy_agents_climb_simple_hill():
+    trajectories = simulate(SimpleHill(), n_agents=50, n_trials=40, sight_radius=10, n_gabors=6, seed=100)
+    assert trajectories.score.shape == (40, 50)
+    assert (trajectories.pos[1:] == trajectories.selected[:-1]).all()
+    assert trajectories.score[-1].min() > 90
+
+def test_simulate_is_reproducible():
+    landscape = SimpleHill()
+    first = simulate(landscape, 20, 10, 10, 6, strategy='softmax', seed=1)
+    second = simulate(landscape, 20, 10, 10, 6, strategy='softmax', seed=1)
+    assert (first.stims == second.stims).all()
+
+def test_sweep_results_do_not_depend_on_n_workers():
+    conditions = simulation.create_conditions(['SimpleHill'], [4, 10], [6], [10])
+    serial = simulation.run_sweep(conditions, n_agents=10, seed=1, n_workers=1)
+    parallel = simulation.run_sweep(conditions, n_agents=10, seed=1, n_workers=2)
+    assert len(serial) == 2
+    assert serial.equals(parallel)
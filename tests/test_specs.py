@@ -0,0 +1,48 @@
+import pytest
+
+from gems.landscape import create_landscape
+from gems.specs import SpecLandscape, compile_spec
+
+SPEC = dict(n_rows=21, n_cols=31, min_ori=10, max_ori=110,
+            score=[dict(hill=dict(x=10, y=20, height=100, width=5)),
+                   dict(noise=dict(scale=2, seed=1))])
+
+
+def test_spec_landscape_scores():
+    landscape = SpecLandscape(SPEC)
+    grid = landscape.get_score_grid()
+    assert grid.shape == (21, 31)
+    assert (grid.min(), grid.max()) == (0, 100)
+    assert landscape.score((3, 4)) == grid[3, 4]
+    assert landscape.min_ori == 10
+
+@pytest.mark.parametrize('grid_pos', [(-1, 0), (0, -1), (21, 0), (0, 31)])
+def test_spec_landscape_scores_off_grid(grid_pos):
+    with pytest.raises(IndexError):
+        SpecLandscape(SPEC).score(grid_pos)
+
+def test_compiled_specs_are_cached_by_hash():
+    assert compile_spec(SPEC) is compile_spec(dict(SPEC))
+
+def test_unknown_component():
+    spec = dict(SPEC, score=[dict(volcano=dict(x=1))])
+    with pytest.raises(ValueError):
+        SpecLandscape(spec)
+
+def test_create_landscape_from_spec_file(tmpdir):
+    spec_file = tmpdir.join('Ridge.yml')
+    spec_file.write('n_rows: 10\nn_cols: 10\nscore:\n  - ridge: {x: 5, y: 5, angle: 90}\n')
+    landscape = create_landscape(str(spec_file))
+    assert landscape.name == 'Ridge'
+    assert landscape.get_score_grid()[5, 0] == 100
+
+def test_unknown_spec_key(tmpdir):
+    spec_file = tmpdir.join('Ridge.yml')
+    spec_file.write('n_rows: 10\nn_cols: 10\nnormalise: true\nscore:\n  - ridge: {x: 5, y: 5}\n')
+    with pytest.raises(ValueError) as excinfo:
+        create_landscape(str(spec_file))
+    assert 'normalise' in str(excinfo.value)
+    assert str(spec_file) in str(excinfo.value)
+
+def test_create_landscape_from_spec_name():
+    assert create_landscape('TwoPeaks').get_score_grid().max() == 100
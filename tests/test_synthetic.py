@@ -0,0 +1,23 @@
+from gems.data import load_data
+from gems.learning import LearningCurves
+from gems.replay import replay
+from gems.synthetic import generate
+
+
+def test_synthetic_sessions_are_valid(tmpdir):
+    n_trials = generate(str(tmpdir), n_chains=3, n_generations=2, n_trials_per_block=5)
+    trials = load_data(str(tmpdir))
+    assert len(trials) == n_trials == 3 * 2 * 4 * 5
+    assert replay(trials).valid.all()
+    assert len(tmpdir.join('instructions').listdir()) == 6
+
+def test_synthetic_chains(tmpdir):
+    generate(str(tmpdir), n_chains=3, n_generations=2, n_trials_per_block=5)
+    curves = LearningCurves(str(tmpdir))
+    assert curves.update() == ['GEMS1', 'GEMS2', 'GEMS3']
+    assert curves.to_frame().generation.tolist() == [1, 2] * 3
+
+def test_synthetic_data_is_seeded(tmpdir):
+    for name in ['a', 'b']:
+        generate(str(tmpdir.join(name)), n_chains=2, n_generations=1, n_trials_per_block=5, seed=1)
+    assert tmpdir.join('a', 'GEMS1.csv').read() == tmpdir.join('b', 'GEMS1.csv').read()
@@ -0,0 +1,31 @@
+from gems.timing import PhaseTimer
+
+
+def test_disabled_timer_records_nothing():
+    timer = PhaseTimer()
+    with timer.phase('win_flip'):
+        pass
+    assert timer.records == []
+
+def test_summarize_adds_repeated_phases_within_a_trial():
+    timer = PhaseTimer(enabled=True)
+    for trial in range(3):
+        timer.trial = trial
+        timer.record('draw', 0.01)
+        timer.record('draw', 0.02)
+        timer.record('win_flip', 0.016)
+    summary = timer.summarize()
+    assert [name for name, _, _, _ in summary] == ['draw', 'win_flip']
+    name, n_trials, percentiles, longest = summary[0]
+    assert n_trials == 3
+    assert abs(longest - 0.03) < 1e-9
+
+def test_write_timing_log(tmpdir):
+    timer = PhaseTimer(enabled=True, profile_blocks=True)
+    with timer.profile('block1'):
+        with timer.phase('sample_gabors'):
+            sum(range(100))
+    timing_log = tmpdir.join('GEMS100.csv')
+    timer.write(str(timing_log))
+    assert timing_log.readlines()[0].strip() == 'block_ix,trial,phase,seconds'
+    assert tmpdir.join('GEMS100-block1.prof').check()
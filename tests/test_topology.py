@@ -0,0 +1,45 @@
+import pytest
+
+from gems import Landscape, SimpleHill
+from gems.topology import find_local_maxima, label_basins, label_plateaus, describe
+
+
+def two_peaks((x, y)):
+    return max(10 - abs(x - 2) - abs(y - 2), 8 - abs(x - 7) - abs(y - 7))
+
+def test_simple_hill_has_a_single_peak():
+    landscape = SimpleHill(normalize=False)
+    assert find_local_maxima(landscape).tolist() == [[50, 50]]
+    labels, peaks = label_basins(landscape)
+    assert peaks.tolist() == [[50, 50]]
+    assert (labels == 0).all()
+
+def terraces((x, y)):
+    return min(x // 3, 2)  # steps of 3 rows, with a flat top from row 6
+
+@pytest.mark.parametrize('radius', [1, 3, 10])
+def test_terraced_simple_hill_has_a_single_peak(radius):
+    summary = describe(SimpleHill(), radius)
+    assert (summary['n_local_maxima'], summary['n_basins']) == (1, 1)
+
+def test_plateaus_are_climbed_across():
+    landscape = Landscape(n_rows=9, n_cols=4, score_func=terraces)
+    labels, first = label_plateaus(landscape)
+    assert len(first) == 3
+    assert find_local_maxima(landscape).tolist() == [[6, 0]]
+    labels, peaks = label_basins(landscape)
+    assert peaks.tolist() == [[6, 0]]
+    assert (labels == 0).all()
+
+def test_label_basins_of_two_peaks():
+    landscape = Landscape(n_rows=10, n_cols=10, score_func=two_peaks)
+    labels, peaks = label_basins(landscape)
+    assert sorted(peaks.tolist()) == [[2, 2], [7, 7]]
+    assert peaks[labels[0, 0]].tolist() == [2, 2]
+    assert peaks[labels[9, 9]].tolist() == [7, 7]
+
+def test_describe_is_cached():
+    landscape = Landscape(n_rows=10, n_cols=10, score_func=two_peaks)
+    summary = describe(landscape)
+    assert summary['n_basins'] == 2
+    assert describe(landscape) is summary